@@ -5,38 +5,268 @@ This script demonstrates how to run audits across multiple AWS regions using IAM
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 import json
+import gzip
+import heapq
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import sys
 
+try:
+    import ijson  # Optional: incremental parsing keeps memory flat on large scans
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional: faster serialization of JSON Lines records
+except ImportError:
+    orjson = None
+
+# Pass --legacy-json to also keep the raw API responses (.json.gz)
+LEGACY_JSON = '--legacy-json' in sys.argv[1:]
+
 # API endpoint
 API_URL = "http://localhost:5000"
 
+# Upper bound on simultaneous connections to the API server
+MAX_CONNECTIONS = 20
+
+# Shared HTTP session: keep-alive reuses connections across requests.
+# The API server speaks HTTP/1.1, so concurrency comes from one kept-alive
+# connection per in-flight request; pool_block makes extra requests wait
+# for a free connection instead of opening throwaway ones.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=MAX_CONNECTIONS,
+    pool_block=True,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update({
+    # gzip/deflate, plus br/zstd when brotli/zstandard are installed
+    "Accept-Encoding": ACCEPT_ENCODING
+})
+
 # User configuration - REPLACE THESE VALUES
 USER_ROLE_ARN = "arn:aws:iam::YOUR_ACCOUNT_ID:role/KostyAuditRole"
 EXTERNAL_ID = "your-unique-external-id"
 
-def run_multi_region_audit(regions, role_arn, external_id):
-    """Run audit across multiple regions"""
-    print(f"\n🌍 Running audit across {len(regions)} regions...")
-    print(f"   Regions: {', '.join(regions)}")
-    
+# Regions to scan
+REGIONS = (
+    "us-east-1",      # US East (N. Virginia)
+    "us-west-2",      # US West (Oregon)
+    "eu-west-1",      # Europe (Ireland)
+    "ap-southeast-1"  # Asia Pacific (Singapore)
+)
+
+# Fields shared by every per-region audit request
+_AUDIT_TEMPLATE = {
+    "max_workers": 10  # Increase workers for parallel processing
+}
+
+# Number of cost savings opportunities to report
+TOP_N = 10
+
+def _save_response(response, filename):
+    """Write a successful response body straight to disk (gzip-compressed) instead of buffering it in memory"""
+    if response.headers.get('Content-Encoding') == 'gzip':
+        # Already gzip on the wire: save the compressed bytes as-is
+        response.raw.decode_content = False
+        with open(filename, 'wb') as f:
+            shutil.copyfileobj(response.raw, f)
+    else:
+        response.raw.decode_content = True
+        with gzip.open(filename, 'wb') as f:
+            shutil.copyfileobj(response.raw, f)
+
+def _describe_failure(response):
+    """Return a readable error for a failed request outcome, or None if it succeeded"""
+    if isinstance(response, requests.exceptions.Timeout):
+        return "request timed out, the audit may still be running"
+    if isinstance(response, requests.exceptions.ConnectionError):
+        return "cannot connect to API server (is ./start-api.sh running?)"
+    if isinstance(response, Exception):
+        return str(response)
+    if response.status_code != 200:
+        return f"{response.status_code} {response.text}"
+    return None
+
+def _audit_one(region, role_arn, external_id, filename):
+    """Run the audit for a single region, streaming the response body to filename"""
     audit_request = {
+        **_AUDIT_TEMPLATE,
         "user_role_arn": role_arn,
         "external_id": external_id,
-        "regions": regions,
-        "max_workers": 10  # Increase workers for parallel processing
+        "regions": [region]
     }
     
-    response = requests.post(
+    response = SESSION.post(
         f"{API_URL}/api/audit",
         json=audit_request,
-        headers={"Content-Type": "application/json"},
-        timeout=600  # 10 minute timeout for large scans
+        timeout=600,  # 10 minute timeout for large scans
+        stream=True
     )
     
+    if response.status_code == 200:
+        _save_response(response, filename)
+    
     return response
 
+def batch_audit(jobs, filename):
+    """
+    Submit several audit jobs in one request to /api/audit/batch,
+    streaming the response body to filename.
+    """
+    response = SESSION.post(
+        f"{API_URL}/api/audit/batch",
+        json={"jobs": jobs},
+        timeout=600,  # 10 minute timeout for large scans
+        stream=True
+    )
+    
+    if response.status_code == 200:
+        _save_response(response, filename)
+    
+    return response
+
+def iter_account_results(filename):
+    """Yield (account_id, account_data) pairs from a saved audit response one at a time"""
+    with gzip.open(filename, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.kvitems(f, 'results', use_float=True)
+        else:
+            yield from json.load(f)['results'].items()
+
+def iter_batch_jobs(filename):
+    """Yield each job result from a saved batch response one at a time"""
+    with gzip.open(filename, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.items(f, 'jobs.item', use_float=True)
+        else:
+            yield from json.load(f)['jobs']
+
+def run_multi_region_audit(regions, role_arn, external_id, timestamp, saved_files):
+    """
+    Audit every region, preferring a single batched request and falling back
+    to concurrent per-region requests when the server has no batch endpoint.
+    Yields (region, error, accounts) tuples, where accounts iterates
+    (account_id, account_data) pairs when error is None. Per-region results
+    are yielded as each region completes, so finished regions can be
+    processed while others still run.
+    """
+    print(f"\n🌍 Running audit across {len(regions)} regions...")
+    print(f"   Regions: {', '.join(regions)}")
+    
+    jobs = [
+        {
+            **_AUDIT_TEMPLATE,
+            "user_role_arn": role_arn,
+            "external_id": external_id,
+            "regions": [region]
+        }
+        for region in regions
+    ]
+    filename = f"multi_region_audit_{timestamp}.json.gz"
+    try:
+        response = batch_audit(jobs, filename)
+    except requests.exceptions.Timeout as e:
+        response = e
+    
+    if getattr(response, 'status_code', None) != 404:
+        error = _describe_failure(response)
+        if error:
+            for region in regions:
+                yield region, error, None
+            return
+        
+        saved_files.append(filename)
+        for region, job in zip(regions, iter_batch_jobs(filename)):
+            if 'error' in job:
+                yield region, job['error'], None
+            else:
+                yield region, None, iter(job['results'].items())
+        return
+    
+    # Older servers without /api/audit/batch: one request per region
+    with ThreadPoolExecutor(max_workers=min(len(regions), MAX_CONNECTIONS)) as executor:
+        futures = {}
+        for region in regions:
+            filename = f"multi_region_audit_{timestamp}_{region}.json.gz"
+            futures[executor.submit(_audit_one, region, role_arn, external_id, filename)] = (region, filename)
+        
+        for future in as_completed(futures):
+            region, filename = futures[future]
+            try:
+                response = future.result()
+            except requests.exceptions.RequestException as e:
+                # One slow or failing region must not discard the others
+                response = e
+            
+            error = _describe_failure(response)
+            if error:
+                yield region, error, None
+            else:
+                saved_files.append(filename)
+                yield region, None, iter_account_results(filename)
+
+def iter_region_accounts(outcomes, failed_regions):
+    """Yield (account_id, account_data) pairs from successful regions, recording failures as they arrive"""
+    for region, error, accounts in outcomes:
+        if error:
+            failed_regions.append((region, error))
+        else:
+            yield from accounts
+
+def _dump_record(record):
+    """Serialize one JSON Lines record to bytes, including the trailing newline"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(record).encode('utf-8') + b'\n'
+
+def iter_cost_items(accounts, account_totals, records_out):
+    """
+    Walk every account result once, accumulating per-account
+    (issues, savings) totals into account_totals, writing every item as a
+    flattened JSON Lines record to records_out, and yielding a
+    (monthly_cost, service, resource, issue, region) tuple for each item
+    with a positive monthly cost.
+    """
+    # Local bindings keep attribute lookups out of the per-item loop
+    get = dict.get
+    write = records_out.write
+    dump = _dump_record
+    
+    for account_id, account_data in accounts:
+        issues = savings = 0
+        for service, service_data in account_data.items():
+            for check_data in service_data.values():
+                issues += check_data['count']
+                savings += get(check_data, 'monthly_savings', 0)
+                for item in get(check_data, 'items', ()):
+                    monthly_cost = get(item, 'monthly_cost', 0)
+                    resource = get(item, 'resource_name') or get(item, 'resource_id', 'Unknown')
+                    issue = get(item, 'Issue', 'Unknown issue')
+                    region = get(item, 'region', 'Unknown')
+                    write(dump({
+                        'account_id': account_id,
+                        'service': service,
+                        'resource': resource,
+                        'issue': issue,
+                        'monthly_cost': monthly_cost,
+                        'region': region
+                    }))
+                    if monthly_cost > 0:
+                        yield (monthly_cost, service, resource, issue, region)
+        prev_issues, prev_savings = account_totals.get(account_id, (0, 0))
+        account_totals[account_id] = (prev_issues + issues, prev_savings + savings)
+
 def main():
     print("🚀 Kosty API - Multi-Region Audit Example")
     print("=" * 60)
@@ -53,96 +283,78 @@ def main():
         print("   5. Update this script with your role ARN and external ID")
         sys.exit(0)
     
-    # Define regions to scan
-    regions = [
-        "us-east-1",      # US East (N. Virginia)
-        "us-west-2",      # US West (Oregon)
-        "eu-west-1",      # Europe (Ireland)
-        "ap-southeast-1"  # Asia Pacific (Singapore)
-    ]
-    
     # Run the audit
     print("\n⏳ Starting multi-region audit...")
     print("   This may take 5-10 minutes depending on your infrastructure...")
     
-    try:
-        response = run_multi_region_audit(regions, USER_ROLE_ARN, EXTERNAL_ID)
-        
-        if response.status_code == 200:
-            results = response.json()
-            
-            print("\n✅ Multi-region audit completed!")
-            print("=" * 60)
-            
-            # Summary
-            summary = results['summary']
-            print(f"\n📊 SUMMARY")
-            print(f"   Total issues: {summary['total_issues']}")
-            print(f"   Monthly savings: ${summary['total_monthly_savings']:,.2f}")
-            print(f"   Annual savings: ${summary['total_annual_savings']:,.2f}")
-            
-            # Break down by region (account in this case)
-            print(f"\n📍 BREAKDOWN BY ACCOUNT/REGION")
-            for account_id, account_data in results['results'].items():
-                account_issues = sum(
-                    sum(cmd['count'] for cmd in svc.values())
-                    for svc in account_data.values()
-                )
-                account_savings = sum(
-                    sum(cmd.get('monthly_savings', 0) for cmd in svc.values())
-                    for svc in account_data.values()
-                )
-                
-                print(f"   Account {account_id}:")
-                print(f"      Issues: {account_issues}")
-                if account_savings > 0:
-                    print(f"      Savings: ${account_savings:,.2f}/month")
-            
-            # Save results
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"multi_region_audit_{timestamp}.json"
-            with open(filename, 'w') as f:
-                json.dump(results, f, indent=2)
-            
-            print(f"\n📄 Full results saved to: {filename}")
-            
-            # Top cost savings opportunities
-            print(f"\n💰 TOP COST SAVINGS OPPORTUNITIES")
-            
-            all_items = []
-            for account_id, account_data in results['results'].items():
-                for service, service_data in account_data.items():
-                    for check, check_data in service_data.items():
-                        for item in check_data.get('items', []):
-                            if item.get('monthly_cost', 0) > 0:
-                                all_items.append({
-                                    'service': service,
-                                    'resource': item.get('resource_name', item.get('resource_id', 'Unknown')),
-                                    'issue': item.get('Issue', 'Unknown issue'),
-                                    'monthly_cost': item.get('monthly_cost', 0),
-                                    'region': item.get('region', 'Unknown')
-                                })
-            
-            # Sort by monthly cost
-            all_items.sort(key=lambda x: x['monthly_cost'], reverse=True)
-            
-            # Show top 10
-            for idx, item in enumerate(all_items[:10], 1):
-                print(f"   {idx}. {item['service'].upper()} - {item['resource']}")
-                print(f"      Region: {item['region']}")
-                print(f"      Issue: {item['issue']}")
-                print(f"      Savings: ${item['monthly_cost']:,.2f}/month")
-                print()
-            
-        else:
-            print(f"\n❌ Audit failed: {response.status_code}")
-            print(response.text)
-            
-    except requests.exceptions.Timeout:
-        print("\n⏱️  Request timed out. The audit may still be running.")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    saved_files = []
+    outcomes = run_multi_region_audit(REGIONS, USER_ROLE_ARN, EXTERNAL_ID, timestamp, saved_files)
+    
+    # Merge per-region results in a single streaming pass as regions complete:
+    # per-account totals, one JSON Lines record per item, and the top-N items
+    # (O(n log N), no full sort)
+    records_filename = f"multi_region_audit_{timestamp}.jsonl.gz"
+    failed_regions = []
+    account_totals = {}
+    with gzip.open(records_filename, 'wb') as records_out:
+        top_items = heapq.nlargest(
+            TOP_N,
+            iter_cost_items(iter_region_accounts(outcomes, failed_regions), account_totals, records_out)
+        )
+    
+    # Raw responses were only needed for parsing unless explicitly requested
+    if not LEGACY_JSON:
+        for filename in saved_files:
+            os.remove(filename)
+    
+    for region, reason in failed_regions:
+        print(f"\n❌ Audit failed for {region}: {reason}")
+    
+    if not saved_files:
+        os.remove(records_filename)
         print("   Try increasing the timeout or reducing the number of regions.")
-    except Exception as e:
-        print(f"\n❌ Error: {e}")
+        return
+    
+    # Build the report in memory and emit it with a single write
+    out = []
+    out.append("\n✅ Multi-region audit completed!")
+    out.append("=" * 60)
+    
+    # Summary
+    total_issues = sum(issues for issues, _ in account_totals.values())
+    total_savings = sum(savings for _, savings in account_totals.values())
+    out.append(f"\n📊 SUMMARY")
+    out.append(f"   Total issues: {total_issues}")
+    out.append(f"   Monthly savings: ${total_savings:,.2f}")
+    out.append(f"   Annual savings: ${total_savings * 12:,.2f}")
+    
+    # Break down by region (account in this case)
+    out.append(f"\n📍 BREAKDOWN BY ACCOUNT/REGION")
+    for account_id, (account_issues, account_savings) in account_totals.items():
+        out.append(f"   Account {account_id}:")
+        out.append(f"      Issues: {account_issues}")
+        if account_savings > 0:
+            out.append(f"      Savings: ${account_savings:,.2f}/month")
+    
+    out.append(f"\n📄 Findings saved to: {records_filename} (one JSON record per line)")
+    if LEGACY_JSON:
+        out.append(f"   Raw API responses:")
+        for filename in saved_files:
+            out.append(f"   {filename}")
+    
+    # Top cost savings opportunities
+    out.append(f"\n💰 TOP COST SAVINGS OPPORTUNITIES")
+    
+    # Show top 10
+    for idx, (monthly_cost, service, resource, issue, region) in enumerate(top_items, 1):
+        out.append(f"   {idx}. {service.upper()} - {resource}")
+        out.append(f"      Region: {region}")
+        out.append(f"      Issue: {issue}")
+        out.append(f"      Savings: ${monthly_cost:,.2f}/month")
+        out.append("")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     try:
@@ -152,3 +364,5 @@ if __name__ == "__main__":
         print("   Make sure the server is running: ./start-api.sh")
     except KeyboardInterrupt:
         print("\n\n⚠️  Audit interrupted by user.")
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
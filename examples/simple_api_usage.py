@@ -5,39 +5,113 @@ This script demonstrates how to use the Kosty API to run audits using IAM role a
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+import hashlib
 import json
+import os
 import sys
+import time
+from pathlib import Path
+
+try:
+    import orjson  # Optional: much faster JSON encoding/decoding
+except ImportError:
+    orjson = None
 
 # API endpoint
 API_URL = "http://localhost:5000"
 
+# Shared HTTP session: keep-alive reuses one connection for every call below
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update({
+    # gzip/deflate, plus br/zstd when brotli/zstandard are installed
+    "Accept-Encoding": ACCEPT_ENCODING
+})
+
+# On-disk cache for endpoints that only change when the server is redeployed
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "kosty"
+CACHE_TTL = 3600  # seconds
+
+# Set KOSTY_SKIP_HEALTH_CHECK=true to skip the health probe on repeat runs
+SKIP_HEALTH_CHECK = os.environ.get("KOSTY_SKIP_HEALTH_CHECK", "false").lower() == "true"
+
 # User configuration - REPLACE THESE VALUES
 USER_ROLE_ARN = "arn:aws:iam::YOUR_ACCOUNT_ID:role/KostyAuditRole"
 EXTERNAL_ID = "your-unique-external-id"  # Unique identifier for your user
 
+AUDIT_REQUEST = {
+    "user_role_arn": USER_ROLE_ARN,
+    "external_id": EXTERNAL_ID,
+    "regions": ["us-east-1"],
+    "max_workers": 5
+}
+
+def _loads(body):
+    """Parse a JSON response body"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def cached_get(path, ttl=CACHE_TTL):
+    """
+    GET a static API endpoint, reusing a cached copy on disk for up to ttl seconds.
+    Returns (body, None) on success or (None, error_text) on failure.
+    """
+    key = hashlib.blake2b(f"{API_URL}{path}".encode("utf-8"), digest_size=8).hexdigest()
+    cache_file = CACHE_DIR / f"{key}.json"
+    
+    try:
+        if time.time() - cache_file.stat().st_mtime < ttl:
+            return _loads(cache_file.read_bytes()), None
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache entry: fetch from the server
+    
+    response = SESSION.get(f"{API_URL}{path}")
+    if response.status_code != 200:
+        return None, response.text
+    
+    # Write atomically so a concurrent run never reads a partial file
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    tmp_file.write_bytes(response.content)
+    os.replace(tmp_file, cache_file)
+    return _loads(response.content), None
+
 def main():
     print("🚀 Kosty API - Simple Audit Example")
     print("=" * 60)
     
     # 0. Get API Account ID (needed for IAM role setup)
     print("\n0. Getting API server Account ID...")
-    response = requests.get(f"{API_URL}/api/account-id")
-    if response.status_code == 200:
-        account_info = response.json()
+    account_info, error = cached_get("/api/account-id")
+    if account_info is not None:
         print(f"   API Account ID: {account_info['account_id']}")
         print(f"   Use this when creating the IAM role trust policy")
     else:
-        print(f"   Warning: Could not get account ID: {response.text}")
+        account_info = {}
+        print(f"   Warning: Could not get account ID: {error}")
     
     # 1. Check API health
-    print("\n1. Checking API health...")
-    response = requests.get(f"{API_URL}/health")
-    print(f"   Status: {response.json()['status']}")
+    if not SKIP_HEALTH_CHECK:
+        print("\n1. Checking API health...")
+        response = SESSION.get(f"{API_URL}/health")
+        print(f"   Status: {_loads(response.content)['status']}")
     
     # 2. List available services
     print("\n2. Getting available services...")
-    response = requests.get(f"{API_URL}/api/services")
-    services = response.json()
+    services, error = cached_get("/api/services")
+    if services is None:
+        print(f"\n❌ Could not list services: {error}")
+        sys.exit(1)
     print(f"   Total services: {services['total_services']}")
     print(f"   Services: {', '.join(list(services['services'])[:5])}...")
     
@@ -54,22 +128,14 @@ def main():
     
     # 4. Run a simple audit
     print("\n4. Running audit for us-east-1...")
-    audit_request = {
-        "user_role_arn": USER_ROLE_ARN,
-        "external_id": EXTERNAL_ID,
-        "regions": ["us-east-1"],
-        "max_workers": 5
-    }
-    
     print("   This may take a few minutes...")
-    response = requests.post(
+    response = SESSION.post(
         f"{API_URL}/api/audit",
-        json=audit_request,
-        headers={"Content-Type": "application/json"}
+        json=AUDIT_REQUEST
     )
     
     if response.status_code == 200:
-        results = response.json()
+        results = _loads(response.content)
         
         print("\n✅ Audit completed successfully!")
         print("=" * 60)
@@ -79,21 +145,25 @@ def main():
         print(f"📈 Annual savings: ${results['summary']['total_annual_savings']:,.2f}")
         
         # Save full results to file
-        with open('audit_results.json', 'w') as f:
-            json.dump(results, f, indent=2)
+        with open('audit_results.json', 'wb') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(results, indent=2).encode('utf-8'))
         print("\n📄 Full results saved to: audit_results.json")
         
         # Show top issues by service
-        print("\n🎯 Issues by service:")
+        out = ["\n🎯 Issues by service:"]
         for account_id, account_data in results['results'].items():
             for service, service_data in account_data.items():
                 for check, check_data in service_data.items():
                     if check_data['count'] > 0:
                         savings = check_data.get('monthly_savings', 0)
                         if savings > 0:
-                            print(f"   • {service.upper()}: {check_data['count']} issues (${savings:,.2f}/mo)")
+                            out.append(f"   • {service.upper()}: {check_data['count']} issues (${savings:,.2f}/mo)")
                         else:
-                            print(f"   • {service.upper()}: {check_data['count']} issues")
+                            out.append(f"   • {service.upper()}: {check_data['count']} issues")
+        sys.stdout.write("\n".join(out) + "\n")
     else:
         print(f"\n❌ Audit failed: {response.status_code}")
         print(response.text)
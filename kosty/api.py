@@ -3,23 +3,418 @@
 Kosty API Server - RESTful API for AWS Cost Optimization & Security Audits
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, request, stream_with_context
 from flask_cors import CORS
 import asyncio
+import functools
+import hashlib
+import json
+import math
+import boto3
+import botocore.loaders
+import botocore.session
+from botocore.config import Config
 import os
-from datetime import datetime
-from typing import Dict, Any, Optional
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Dict, Any, Optional, Tuple
 import traceback
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
 from kosty.core.scanner import ComprehensiveScanner
 from kosty.core.config import ConfigManager
 from kosty.core.alert_feed import AlertFeedService
+from kosty.services.cost_explorer_audit import CostExplorerAuditService
+from kosty.services.guardduty_audit import GuardDutyAuditService
+
+# The audit and alert services hold no per-request state, so one instance is shared
+_cost_explorer_service = CostExplorerAuditService()
+_guardduty_service = GuardDutyAuditService()
+_alert_feed_service = AlertFeedService()
+
+# Debug mode (read once at startup): enables tracebacks in error responses
+DEBUG = os.environ.get('DEBUG', 'false').lower() == 'true'
+
+# Comma-separated origins allowed to call the API from a browser
+CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
 
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
 
+# Without orjson, responses go through Flask's encoder: skip sorting the keys of large
+# audit trees (and keep the same key order orjson would produce)
+app.json.sort_keys = False
+
+# Compress JSON responses (audit results shrink 5-10x) when flask-compress is installed
+if Compress is not None:
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    app.config['COMPRESS_BR_LEVEL'] = 4
+    app.config['COMPRESS_MIMETYPES'] = ['application/json', 'application/x-ndjson']
+    Compress(app)
+
+# CORS only for the /api/* routes (not / or /health probes); browsers may cache
+# preflight responses for a day
+CORS(
+    app,
+    resources={r'/api/*': {'origins': CORS_ORIGINS}},
+    methods=['GET', 'POST', 'OPTIONS'],
+    allow_headers=['Content-Type', 'Authorization'],
+    max_age=86400
+)
+
+# Maximum number of audit jobs accepted by /api/audit/batch
+MAX_BATCH_JOBS = 20
+
+# Maximum number of regions queried concurrently by the per-region endpoints
+MAX_REGION_WORKERS = 16
+
+# Client-side request rates (per second) and bursts, kept under the AWS API
+# quotas so bursts of requests queue here instead of being throttled by AWS
+RATE_LIMITS = {
+    'ce': (2, 5),
+    'sts': (10, 20)
+}
+
+# Assumed-role credentials are reused until this many seconds before they expire
+CREDENTIALS_REFRESH_MARGIN = 300
+
+# Roles whose credentials are kept at most; the least recently used are dropped beyond that
+CREDENTIALS_CACHE_SIZE = 256
+
+# (user_role_arn, external_id) -> STS Credentials dict, in LRU order
+_credentials_cache: 'OrderedDict[Tuple[str, Optional[str]], Dict[str, Any]]' = OrderedDict()
+_credentials_lock = threading.Lock()
+
+# Fixed pool of locks held while a role is being assumed, picked by hashing
+# (user_role_arn, external_id), so concurrent requests for a role share one lock
+_assume_role_locks = tuple(threading.Lock() for _ in range(32))
+
+# Client settings for every AWS client the API creates: adaptive retries back off
+# client-side under throttling, and the larger pool fits the per-region fan-out
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True
+)
+
+# Service-model loader shared by every session the API creates, so the JSON
+# models are parsed once per process instead of once per session
+_data_loader = botocore.loaders.create_loader()
+
+# STS client shared by all requests (created on first use, keeps its connection pool warm)
+_sts_client = None
+_sts_client_lock = threading.Lock()
+
+# The server's own identity never changes while it runs; a failed lookup is
+# retried after CALLER_IDENTITY_RETRY seconds
+CALLER_IDENTITY_RETRY = 5
+_caller_identity = None
+_caller_identity_error: Optional[Tuple[Exception, float]] = None
+_caller_identity_lock = threading.Lock()
+
+# Role sessions (each holding its own client pools) kept at most; the least
+# recently used one is dropped beyond that
+SESSION_CACHE_SIZE = 64
+
+# (user_role_arn, external_id) -> (AccessKeyId the session was built with, session), in LRU order
+_session_cache: 'OrderedDict[Tuple[str, Optional[str]], Tuple[str, Any]]' = OrderedDict()
+_default_session = None
+_sessions_lock = threading.Lock()
+
+
+class _TokenBucket:
+    """Token bucket rate limiter: acquire() blocks until a token is available"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) / self.rate
+            
+            time.sleep(wait)
+
+
+# Rate limiters kept at most; the least recently used are dropped beyond that
+# (a dropped limiter has been idle longest, so it would have refilled anyway)
+RATE_LIMITERS_SIZE = 1024
+
+# (api, caller) -> _TokenBucket, in LRU order
+_rate_limiters: 'OrderedDict[Tuple[str, Optional[str]], _TokenBucket]' = OrderedDict()
+_rate_limiters_lock = threading.Lock()
+
+
+def _rate_limited(api: str, caller: Optional[str], fetch):
+    """Call fetch() once the (api, caller) rate limiter allows another request"""
+    key = (api, caller)
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = _rate_limiters[key] = _TokenBucket(*RATE_LIMITS[api])
+            while len(_rate_limiters) > RATE_LIMITERS_SIZE:
+                _rate_limiters.popitem(last=False)
+        else:
+            _rate_limiters.move_to_end(key)
+    
+    limiter.acquire()
+    return fetch()
+
+# Audit results are reused by the alert endpoints for this many seconds
+AUDIT_CACHE_TTL = 300
+
+# audit cache key -> (response_data, time.monotonic() when stored)
+_audit_cache: Dict[Tuple, Tuple[Dict[str, Any], float]] = {}
+
+# audit cache key -> Future of the scan currently running for that key
+_inflight_audits: Dict[Tuple, Future] = {}
+
+# Guards both _audit_cache and _inflight_audits
+_audit_cache_lock = threading.Lock()
+
+# Number of worker processes audits run in (0 = run in the request thread)
+AUDIT_PROCESSES = int(os.environ.get('KOSTY_AUDIT_PROCESSES', 0))
+_audit_pool = None
+_audit_pool_lock = threading.Lock()
+
+# Event loop shared by all audits, running in a daemon thread (created on first use)
+_audit_loop = None
+_audit_loop_lock = threading.Lock()
+
+
+# Static payloads for the read-only endpoints, encoded once at import time
+INDEX_INFO = {
+    'name': 'Kosty API',
+    'version': '1.0.0',
+    'description': 'AWS Cost Optimization & Security Audit API',
+    'endpoints': {
+        '/': 'API documentation (this page)',
+        '/health': 'Health check endpoint',
+        '/api/account-id': 'Get API server AWS Account ID (needed for IAM role setup)',
+        '/api/audit': 'Run comprehensive AWS audit (POST)',
+        '/api/audit/batch': 'Run several audits in one request (POST)',
+        '/api/audit/stream': 'Run comprehensive AWS audit, results as NDJSON (POST)',
+        '/api/services': 'List available AWS services for auditing (GET)',
+        '/api/costs': 'Get cost analysis by service (POST)',
+        '/api/costs/trends': 'Get cost trends over time (POST)',
+        '/api/costs/anomalies': 'Detect cost anomalies (POST)',
+        '/api/budgets': 'Check budget thresholds (POST)',
+        '/api/guardduty': 'Check GuardDuty status and findings (POST)',
+        '/api/alerts/feed': 'Get alert feed (daily or real-time) (POST)',
+        '/api/alerts/summary': 'Get alert summary statistics (POST)',
+        '/api/alerts/configure': 'Configure alert thresholds (POST)'
+    },
+    'documentation': 'https://github.com/kosty-cloud/kosty'
+}
+
+SERVICES_INFO = {
+    'ec2': {
+        'name': 'EC2',
+        'description': 'Elastic Compute Cloud instances',
+        'checks': ['stopped_instances', 'idle_instances', 'oversized_instances', 'ssh_open', 'imdsv1']
+    },
+    's3': {
+        'name': 'S3',
+        'description': 'Simple Storage Service buckets',
+        'checks': ['empty_buckets', 'public_read_access', 'encryption_at_rest', 'lifecycle_policy']
+    },
+    'rds': {
+        'name': 'RDS',
+        'description': 'Relational Database Service instances',
+        'checks': ['public_databases', 'oversized_instances', 'unused_read_replicas', 'unencrypted_storage']
+    },
+    'lambda': {
+        'name': 'Lambda',
+        'description': 'Serverless compute functions',
+        'checks': ['unused_functions', 'over_provisioned_memory']
+    },
+    'ebs': {
+        'name': 'EBS',
+        'description': 'Elastic Block Store volumes',
+        'checks': ['orphan_volumes', 'unencrypted_orphan', 'old_snapshots']
+    },
+    'iam': {
+        'name': 'IAM',
+        'description': 'Identity and Access Management',
+        'checks': ['root_access_keys', 'unused_roles', 'inactive_users', 'old_access_keys']
+    },
+    'eip': {
+        'name': 'EIP',
+        'description': 'Elastic IP addresses',
+        'checks': ['unattached_eips', 'eips_on_stopped_instances']
+    },
+    'lb': {
+        'name': 'Load Balancer',
+        'description': 'Application and Network Load Balancers',
+        'checks': ['no_healthy_targets', 'unused_load_balancers']
+    },
+    'nat': {
+        'name': 'NAT Gateway',
+        'description': 'Network Address Translation gateways',
+        'checks': ['unused_gateways', 'redundant_gateways']
+    },
+    'sg': {
+        'name': 'Security Groups',
+        'description': 'VPC security groups',
+        'checks': ['unused_groups', 'overly_permissive']
+    },
+    'cloudwatch': {
+        'name': 'CloudWatch',
+        'description': 'Monitoring and logging service',
+        'checks': ['unused_alarms', 'expensive_log_retention']
+    },
+    'dynamodb': {
+        'name': 'DynamoDB',
+        'description': 'NoSQL database service',
+        'checks': ['idle_tables', 'over_provisioned_capacity']
+    },
+    'route53': {
+        'name': 'Route53',
+        'description': 'DNS web service',
+        'checks': ['unused_hosted_zones']
+    },
+    'apigateway': {
+        'name': 'API Gateway',
+        'description': 'API management service',
+        'checks': ['unused_apis']
+    },
+    'backup': {
+        'name': 'AWS Backup',
+        'description': 'Centralized backup service',
+        'checks': ['empty_vaults']
+    },
+    'snapshots': {
+        'name': 'EBS Snapshots',
+        'description': 'EBS volume snapshots',
+        'checks': ['old_snapshots', 'public_snapshots']
+    },
+    'cost_explorer': {
+        'name': 'Cost Explorer',
+        'description': 'AWS cost analysis and monitoring',
+        'checks': ['cost_by_service', 'cost_anomaly_detection', 'budget_threshold']
+    },
+    'guardduty': {
+        'name': 'GuardDuty',
+        'description': 'Intelligent threat detection service',
+        'checks': ['guardduty_enabled', 'guardduty_finding']
+    }
+}
+
+_INDEX_BODY = json.dumps(INDEX_INFO)
+_HEALTH_BODY = json.dumps({'status': 'healthy', 'service': 'kosty-api'})
+_SERVICES_BODY = json.dumps({
+    'services': SERVICES_INFO,
+    'total_services': len(SERVICES_INFO)
+})
+
+# Cache-Control for the static documentation endpoints (not /health)
+STATIC_CACHE_CONTROL = 'public, max-age=3600'
+
+# Strong ETags for the cacheable static bodies, so clients can revalidate with a 304
+_INDEX_ETAG = hashlib.sha1(_INDEX_BODY.encode('utf-8')).hexdigest()
+_SERVICES_ETAG = hashlib.sha1(_SERVICES_BODY.encode('utf-8')).hexdigest()
+
+# Request body schemas: field -> (accepted type(s), default). Lists are lists of strings.
+ROLE_FIELDS = {
+    'user_role_arn': (str, None),
+    'external_id': (str, None)
+}
+
+AUDIT_REQUEST_FIELDS = {
+    **ROLE_FIELDS,
+    'organization': (bool, False),
+    'regions': (list, ['us-east-1']),
+    'max_workers': (int, 5),
+    'cross_account_role': (str, 'OrganizationAccountAccessRole'),
+    'org_admin_account_id': (str, None),
+    'profile': (str, 'default'),
+    'config_file': (str, None)
+}
+
+COSTS_REQUEST_FIELDS = {
+    **ROLE_FIELDS,
+    'regions': (list, ['us-east-1']),
+    'period': (str, 'MONTHLY')
+}
 
-def run_audit_sync(
+COST_TRENDS_REQUEST_FIELDS = {
+    **ROLE_FIELDS,
+    'services': (list, None),
+    'days': (int, 30)
+}
+
+GUARDDUTY_REQUEST_FIELDS = {
+    **ROLE_FIELDS,
+    'regions': (list, ['us-east-1']),
+    'days': (int, 30)
+}
+
+ALERT_SUMMARY_REQUEST_FIELDS = {
+    **ROLE_FIELDS,
+    'regions': (list, ['us-east-1'])
+}
+
+ALERT_FEED_REQUEST_FIELDS = {
+    **ALERT_SUMMARY_REQUEST_FIELDS,
+    'feed_type': (str, 'daily'),
+    'alert_types': (list, None),
+    'severity_min': (str, None)
+}
+
+ALERT_CONFIG_REQUEST_FIELDS = {
+    'budget_threshold_percentage': ((int, float), 80),
+    'cost_spike_threshold': ((int, float), 100),
+    'idle_days_threshold': (int, 7)
+}
+
+# Numeric fields that must be >= 1
+POSITIVE_FIELDS = {'max_workers', 'days'}
+
+_TYPE_NAMES = {
+    str: 'a string',
+    bool: 'a boolean',
+    int: 'an integer',
+    (int, float): 'a number',
+    list: 'a list of strings'
+}
+
+
+class RequestValidationError(ValueError):
+    """Raised when a request body does not match its schema (returned as a 400)"""
+
+
+async def run_audit_async(
     organization: bool = False,
     regions: Optional[list] = None,
     max_workers: int = 5,
@@ -32,59 +427,46 @@ def run_audit_sync(
 ) -> Dict[str, Any]:
     """
     Run a comprehensive audit and return results as JSON.
-    This is a synchronous wrapper around the async scanner.
+    Awaits the async scanner directly, so it can run on an existing event loop;
+    blocking STS calls are dispatched to a worker thread.
     
     Args:
         user_role_arn: ARN of the role in the user's AWS account to assume
         external_id: External ID for additional security when assuming the role
     """
-    import boto3
-    
     session = None
     config_manager = None
+    loop = asyncio.get_event_loop()
     
     # Priority: user_role_arn > config file > default credentials
     if user_role_arn:
         # Assume role in user's account
         try:
-            sts = boto3.client('sts')
-            
-            assume_role_params = {
-                'RoleArn': user_role_arn,
-                'RoleSessionName': 'kosty-api-audit',
-                'DurationSeconds': 3600
-            }
-            
-            # Add external ID if provided for additional security
-            if external_id:
-                assume_role_params['ExternalId'] = external_id
-            
-            response = sts.assume_role(**assume_role_params)
-            
-            session = boto3.Session(
-                aws_access_key_id=response['Credentials']['AccessKeyId'],
-                aws_secret_access_key=response['Credentials']['SecretAccessKey'],
-                aws_session_token=response['Credentials']['SessionToken']
+            session = await loop.run_in_executor(
+                None,
+                _create_session,
+                user_role_arn,
+                external_id
             )
         except Exception as e:
-            import sys
             print(f"Error: Failed to assume role {user_role_arn}: {e}", file=sys.stderr)
             raise Exception(f"Failed to assume role in user's account: {str(e)}")
     else:
         # Try to use config file or default credentials
         try:
-            config_manager = ConfigManager(
-                config_file=config_file,
-                profile=profile
+            # Reading the config and a profile AssumeRole both block, so run them off the loop
+            config_manager, session = await loop.run_in_executor(
+                None,
+                _config_session,
+                config_file,
+                profile
             )
-            session = config_manager.get_aws_session()
         except Exception as e:
             # Config manager initialization failed, will use default AWS credentials
-            import sys
             print(f"Warning: Config manager initialization failed: {e}", file=sys.stderr)
             print("Using default AWS credentials from environment or credentials file", file=sys.stderr)
             config_manager = None
-            session = None
+            session = await loop.run_in_executor(None, _create_session, None)
     
     # Default to us-east-1 if no regions specified
     if regions is None:
@@ -102,7 +484,10 @@ def run_audit_sync(
     )
     
     # Run scan
-    reporter = asyncio.run(scanner.run_comprehensive_scan())
+    reporter = await scanner.run_comprehensive_scan()
+    
+    # Totals are accumulated in a single pass over the results tree
+    total_issues, total_monthly_savings = reporter.get_totals()
     
     # Prepare response data
     response_data = {
@@ -111,63 +496,278 @@ def run_audit_sync(
         'org_admin_account_id': reporter.org_admin_account_id,
         'results': reporter.results,
         'summary': {
-            'total_issues': sum(
-                sum(cmd['count'] for cmd in svc.values()) 
-                for acc in reporter.results.values() 
-                for svc in acc.values()
-            ),
-            'total_monthly_savings': sum(
-                sum(cmd.get('monthly_savings', 0) for cmd in svc.values()) 
-                for acc in reporter.results.values() 
-                for svc in acc.values()
-            )
+            'total_issues': total_issues,
+            'total_monthly_savings': total_monthly_savings,
+            'total_annual_savings': total_monthly_savings * 12
         }
     }
     
-    # Add annual savings
-    response_data['summary']['total_annual_savings'] = (
-        response_data['summary']['total_monthly_savings'] * 12
+    return response_data
+
+
+def _config_session(config_file: Optional[str], profile: str):
+    """Load the config file and build its AWS session, returning (config_manager, session)"""
+    config_manager = ConfigManager(
+        config_file=config_file,
+        profile=profile
     )
+    return config_manager, config_manager.get_aws_session(client_config=AWS_CLIENT_CONFIG)
+
+
+def run_audit_sync(**kwargs) -> Dict[str, Any]:
+    """
+    Synchronous wrapper around run_audit_async() for the Flask (WSGI) handlers.
+    Accepts the same keyword arguments as run_audit_async().
     
-    return response_data
+    Concurrent calls for the same audit share a single scan: only the first
+    caller runs it, the others wait for its result.
+    """
+    key = _audit_cache_key(kwargs)
+    with _audit_cache_lock:
+        future = _inflight_audits.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _inflight_audits[key] = future
+    
+    if not owner:
+        return future.result()
+    
+    try:
+        if AUDIT_PROCESSES > 0:
+            result = _get_audit_pool().submit(_run_audit_blocking, kwargs).result()
+        else:
+            result = _run_audit_blocking(kwargs)
+    except BaseException as e:
+        with _audit_cache_lock:
+            _inflight_audits.pop(key, None)
+        future.set_exception(e)
+        raise
+    
+    now = time.monotonic()
+    with _audit_cache_lock:
+        # Drop expired entries so the cache does not grow without bound
+        for expired in [k for k, (_, stored) in _audit_cache.items() if now - stored > AUDIT_CACHE_TTL]:
+            del _audit_cache[expired]
+        _audit_cache[key] = (result, now)
+        _inflight_audits.pop(key, None)
+    
+    future.set_result(result)
+    return result
+
+
+def _run_audit_blocking(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one audit on the shared audit event loop and wait for its result
+    (also the entry point for pool workers).
+    """
+    future = asyncio.run_coroutine_threadsafe(run_audit_async(**kwargs), _get_audit_loop())
+    return future.result()
+
+
+def _get_audit_loop():
+    """
+    Return the event loop audits run on, starting it in a daemon thread on
+    first use. Uses uvloop when it is installed.
+    """
+    global _audit_loop
+    
+    if _audit_loop is None:
+        with _audit_loop_lock:
+            if _audit_loop is None:
+                loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+                threading.Thread(
+                    target=_run_loop_forever,
+                    args=(loop,),
+                    name='kosty-audit-loop',
+                    daemon=True
+                ).start()
+                _audit_loop = loop
+    
+    return _audit_loop
+
+
+def _run_loop_forever(loop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def _reset_audit_loop():
+    """The loop thread does not survive fork(), so a child process starts its own"""
+    global _audit_loop
+    _audit_loop = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_audit_loop)
+
+
+def _get_audit_pool() -> ProcessPoolExecutor:
+    """Return the audit process pool, creating it on first use"""
+    global _audit_pool
+    
+    if _audit_pool is None:
+        with _audit_pool_lock:
+            if _audit_pool is None:
+                _audit_pool = ProcessPoolExecutor(max_workers=AUDIT_PROCESSES)
+    
+    return _audit_pool
+
+
+def run_audit_cached(**kwargs) -> Dict[str, Any]:
+    """
+    Like run_audit_sync(), but returns the result of an identical audit run
+    within the last AUDIT_CACHE_TTL seconds instead of scanning again.
+    """
+    key = _audit_cache_key(kwargs)
+    with _audit_cache_lock:
+        cached = _audit_cache.get(key)
+    
+    if cached and time.monotonic() - cached[1] <= AUDIT_CACHE_TTL:
+        return cached[0]
+    
+    return run_audit_sync(**kwargs)
+
+
+def _audit_cache_key(kwargs: Dict[str, Any]) -> Tuple:
+    """Build the audit cache key from run_audit_async() arguments (max_workers does not affect results)"""
+    return (
+        kwargs.get('user_role_arn'),
+        kwargs.get('external_id'),
+        tuple(kwargs.get('regions') or ['us-east-1']),
+        bool(kwargs.get('organization', False)),
+        kwargs.get('cross_account_role', 'OrganizationAccountAccessRole'),
+        kwargs.get('org_admin_account_id'),
+        kwargs.get('profile', 'default'),
+        kwargs.get('config_file')
+    )
+
+
+def _request_json() -> Any:
+    """
+    Decode the request body (orjson when installed); an empty body is {}.
+    Malformed JSON raises RequestValidationError.
+    """
+    body = request.get_data(cache=False)
+    if not body.strip():
+        return {}
+    
+    try:
+        return orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError as e:
+        raise RequestValidationError(f'request body must be valid JSON: {e}')
+
+
+def _coerce_form_value(value: str, expected: Any) -> Any:
+    """
+    Convert a string sent by a form-driven client (the test dashboard posts
+    selects and edited number inputs as strings) to the expected bool/number.
+    Returns the string unchanged when it does not convert, so the type check
+    still reports it.
+    """
+    text = value.strip()
+    if expected is bool:
+        return {'true': True, 'false': False}.get(text.lower(), value)
+    
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    if expected == (int, float):
+        try:
+            number = float(text)
+        except ValueError:
+            return value
+        if math.isfinite(number):
+            return number
+    return value
+
+
+def _parse_request(data: Any, fields: Dict[str, Tuple[Any, Any]]) -> Dict[str, Any]:
+    """
+    Validate a request body against a field table in one pass, returning every
+    field with defaults applied. Missing and null fields take the default.
+    """
+    if not isinstance(data, dict):
+        raise RequestValidationError('request body must be a JSON object')
+    
+    parsed = {}
+    for name, (expected, default) in fields.items():
+        value = data.get(name)
+        
+        if value is None:
+            parsed[name] = list(default) if isinstance(default, list) else default
+            continue
+        
+        if isinstance(value, str) and expected in (bool, int, (int, float)):
+            value = _coerce_form_value(value, expected)
+        
+        # bool is a subclass of int, but true/false is not a valid number here
+        valid = isinstance(value, expected) and not (expected is not bool and isinstance(value, bool))
+        if valid and expected is list:
+            valid = all(isinstance(item, str) for item in value)
+        
+        if not valid:
+            raise RequestValidationError(f'{name} must be {_TYPE_NAMES[expected]}')
+        
+        if name in POSITIVE_FIELDS and value < 1:
+            raise RequestValidationError(f'{name} must be at least 1')
+        
+        parsed[name] = value
+    
+    return parsed
+
+
+def _handle_errors(view):
+    """
+    Decorator turning any exception raised by a view into a JSON 500 response
+    (400 for RequestValidationError).
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            return view(*args, **kwargs)
+        except RequestValidationError as e:
+            return _json_response({
+                'error': str(e)
+            }, 400)
+        except Exception as e:
+            return _json_response(_error_body(e), 500)
+    
+    return wrapper
+
+
+def _error_body(e: Exception) -> Dict[str, Any]:
+    """
+    Build the JSON error body for an exception being handled. The traceback is
+    only formatted in debug mode, where it is included in the body.
+    """
+    error_response = {
+        'error': str(e),
+        'type': type(e).__name__
+    }
+    
+    # Only include traceback in debug mode to avoid leaking system information
+    if DEBUG:
+        error_response['traceback'] = traceback.format_exc()
+    
+    return error_response
 
 
 @app.route('/', methods=['GET'])
 def index():
     """Root endpoint - API documentation"""
-    return jsonify({
-        'name': 'Kosty API',
-        'version': '1.0.0',
-        'description': 'AWS Cost Optimization & Security Audit API',
-        'endpoints': {
-            '/': 'API documentation (this page)',
-            '/health': 'Health check endpoint',
-            '/api/account-id': 'Get API server AWS Account ID (needed for IAM role setup)',
-            '/api/audit': 'Run comprehensive AWS audit (POST)',
-            '/api/services': 'List available AWS services for auditing (GET)',
-            '/api/costs': 'Get cost analysis by service (POST)',
-            '/api/costs/trends': 'Get cost trends over time (POST)',
-            '/api/costs/anomalies': 'Detect cost anomalies (POST)',
-            '/api/budgets': 'Check budget thresholds (POST)',
-            '/api/guardduty': 'Check GuardDuty status and findings (POST)',
-            '/api/alerts/feed': 'Get alert feed (daily or real-time) (POST)',
-            '/api/alerts/summary': 'Get alert summary statistics (POST)',
-            '/api/alerts/configure': 'Configure alert thresholds (POST)'
-        },
-        'documentation': 'https://github.com/kosty-cloud/kosty'
-    })
+    return _static_json_response(_INDEX_BODY, etag=_INDEX_ETAG)
 
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'kosty-api'
-    })
+    return _static_json_response(_HEALTH_BODY)
 
 
 @app.route('/api/account-id', methods=['GET'])
+@_handle_errors
 def get_account_id():
     """
     Get the AWS Account ID of the API server.
@@ -179,134 +779,23 @@ def get_account_id():
         "instructions": "Use this Account ID when creating the IAM role in your AWS account"
     }
     """
-    try:
-        import boto3
-        sts = boto3.client('sts')
-        identity = sts.get_caller_identity()
-        
-        return jsonify({
-            'account_id': identity['Account'],
-            'arn': identity['Arn'],
-            'instructions': 'Use this Account ID when creating the trust relationship for the IAM role in your AWS account'
-        })
-    except Exception as e:
-        import os
-        debug_mode = os.environ.get('DEBUG', 'false').lower() == 'true'
-        
-        error_response = {
-            'error': str(e),
-            'type': type(e).__name__
-        }
-        
-        if debug_mode:
-            error_response['traceback'] = traceback.format_exc()
-        
-        return jsonify(error_response), 500
+    identity = _get_caller_identity()
+    
+    return _json_response({
+        'account_id': identity['Account'],
+        'arn': identity['Arn'],
+        'instructions': 'Use this Account ID when creating the trust relationship for the IAM role in your AWS account'
+    })
 
 
 @app.route('/api/services', methods=['GET'])
 def list_services():
     """List all available services that can be audited"""
-    services_info = {
-        'ec2': {
-            'name': 'EC2',
-            'description': 'Elastic Compute Cloud instances',
-            'checks': ['stopped_instances', 'idle_instances', 'oversized_instances', 'ssh_open', 'imdsv1']
-        },
-        's3': {
-            'name': 'S3',
-            'description': 'Simple Storage Service buckets',
-            'checks': ['empty_buckets', 'public_read_access', 'encryption_at_rest', 'lifecycle_policy']
-        },
-        'rds': {
-            'name': 'RDS',
-            'description': 'Relational Database Service instances',
-            'checks': ['public_databases', 'oversized_instances', 'unused_read_replicas', 'unencrypted_storage']
-        },
-        'lambda': {
-            'name': 'Lambda',
-            'description': 'Serverless compute functions',
-            'checks': ['unused_functions', 'over_provisioned_memory']
-        },
-        'ebs': {
-            'name': 'EBS',
-            'description': 'Elastic Block Store volumes',
-            'checks': ['orphan_volumes', 'unencrypted_orphan', 'old_snapshots']
-        },
-        'iam': {
-            'name': 'IAM',
-            'description': 'Identity and Access Management',
-            'checks': ['root_access_keys', 'unused_roles', 'inactive_users', 'old_access_keys']
-        },
-        'eip': {
-            'name': 'EIP',
-            'description': 'Elastic IP addresses',
-            'checks': ['unattached_eips', 'eips_on_stopped_instances']
-        },
-        'lb': {
-            'name': 'Load Balancer',
-            'description': 'Application and Network Load Balancers',
-            'checks': ['no_healthy_targets', 'unused_load_balancers']
-        },
-        'nat': {
-            'name': 'NAT Gateway',
-            'description': 'Network Address Translation gateways',
-            'checks': ['unused_gateways', 'redundant_gateways']
-        },
-        'sg': {
-            'name': 'Security Groups',
-            'description': 'VPC security groups',
-            'checks': ['unused_groups', 'overly_permissive']
-        },
-        'cloudwatch': {
-            'name': 'CloudWatch',
-            'description': 'Monitoring and logging service',
-            'checks': ['unused_alarms', 'expensive_log_retention']
-        },
-        'dynamodb': {
-            'name': 'DynamoDB',
-            'description': 'NoSQL database service',
-            'checks': ['idle_tables', 'over_provisioned_capacity']
-        },
-        'route53': {
-            'name': 'Route53',
-            'description': 'DNS web service',
-            'checks': ['unused_hosted_zones']
-        },
-        'apigateway': {
-            'name': 'API Gateway',
-            'description': 'API management service',
-            'checks': ['unused_apis']
-        },
-        'backup': {
-            'name': 'AWS Backup',
-            'description': 'Centralized backup service',
-            'checks': ['empty_vaults']
-        },
-        'snapshots': {
-            'name': 'EBS Snapshots',
-            'description': 'EBS volume snapshots',
-            'checks': ['old_snapshots', 'public_snapshots']
-        },
-        'cost_explorer': {
-            'name': 'Cost Explorer',
-            'description': 'AWS cost analysis and monitoring',
-            'checks': ['cost_by_service', 'cost_anomaly_detection', 'budget_threshold']
-        },
-        'guardduty': {
-            'name': 'GuardDuty',
-            'description': 'Intelligent threat detection service',
-            'checks': ['guardduty_enabled', 'guardduty_finding']
-        }
-    }
-    
-    return jsonify({
-        'services': services_info,
-        'total_services': len(services_info)
-    })
+    return _static_json_response(_SERVICES_BODY, etag=_SERVICES_ETAG)
 
 
 @app.route('/api/audit', methods=['POST'])
+@_handle_errors
 def run_audit():
     """
     Run a comprehensive AWS audit.
@@ -335,60 +824,145 @@ def run_audit():
         }
     }
     """
+    # Get request data
+    audit_kwargs = _audit_kwargs(_request_json())
+    
+    # Run the audit
+    result = run_audit_sync(**audit_kwargs)
+    
+    # Stream the document account by account rather than encoding it in one piece
+    return app.response_class(
+        stream_with_context(_iter_audit_json(result)),
+        mimetype='application/json'
+    )
+
+
+@app.route('/api/audit/stream', methods=['POST'])
+@_handle_errors
+def run_audit_stream():
+    """
+    Run a comprehensive AWS audit and stream the result as NDJSON, one JSON
+    object per line, instead of a single document.
+    
+    Request body (JSON): same as /api/audit
+    
+    Response (application/x-ndjson):
+    {"type": "scan", "scan_timestamp": "...", "organization": false, "org_admin_account_id": null}
+    {"type": "account", "account": "current", "data": { ... }}   // one line per account
+    {"type": "summary", "summary": { ... }}
+    """
+    audit_kwargs = _audit_kwargs(_request_json())
+    
+    result = run_audit_sync(**audit_kwargs)
+    
+    return app.response_class(
+        stream_with_context(_iter_audit_ndjson(result)),
+        mimetype='application/x-ndjson'
+    )
+
+
+def _iter_audit_json(result: Dict[str, Any]):
+    """
+    Yield an audit result as one JSON document in pieces (same shape as
+    _json_response(result)), encoding one account at a time.
+    """
+    yield b'{"scan_timestamp":' + _dumps(result['scan_timestamp'])
+    yield b',"organization":' + _dumps(result['organization'])
+    yield b',"org_admin_account_id":' + _dumps(result['org_admin_account_id'])
+    yield b',"results":{'
+    
+    separator = b''
+    for account_id, account_results in result['results'].items():
+        yield separator + _dumps(str(account_id)) + b':' + _dumps(account_results)
+        separator = b','
+    
+    yield b'},"summary":' + _dumps(result['summary']) + b'}'
+
+
+def _iter_audit_ndjson(result: Dict[str, Any]):
+    """Yield an audit result as NDJSON lines, one account at a time"""
+    yield _dumps_line({
+        'type': 'scan',
+        'scan_timestamp': result['scan_timestamp'],
+        'organization': result['organization'],
+        'org_admin_account_id': result['org_admin_account_id']
+    })
+    
+    for account_id, account_results in result['results'].items():
+        yield _dumps_line({
+            'type': 'account',
+            'account': account_id,
+            'data': account_results
+        })
+    
+    yield _dumps_line({
+        'type': 'summary',
+        'summary': result['summary']
+    })
+
+
+@app.route('/api/audit/batch', methods=['POST'])
+@_handle_errors
+def run_audit_batch():
+    """
+    Run several audits in a single request. Jobs run in parallel.
+    
+    Request body (JSON):
+    {
+        "jobs": [                                 // Required: 1-20 audit requests
+            {"user_role_arn": "...", "regions": ["us-east-1"]},
+            {"user_role_arn": "...", "regions": ["eu-west-1"]}
+        ]
+    }
+    Each job accepts the same fields as /api/audit.
+    
+    Response (JSON):
+    {
+        "jobs": [
+            { "scan_timestamp": "...", "results": { ... }, "summary": { ... } },
+            { "error": "...", "type": "..." }     // A failed job does not fail the batch
+        ]
+    }
+    Job results are returned in request order.
+    """
+    data = _request_json()
+    if not isinstance(data, dict):
+        raise RequestValidationError('request body must be a JSON object')
+    jobs = data.get('jobs')
+    
+    if not isinstance(jobs, list) or not jobs:
+        return _json_response({
+            'error': 'jobs must be a non-empty list of audit requests'
+        }, 400)
+    
+    if len(jobs) > MAX_BATCH_JOBS:
+        return _json_response({
+            'error': f'at most {MAX_BATCH_JOBS} jobs are allowed per batch'
+        }, 400)
+    
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        results = list(executor.map(_run_batch_job, jobs))
+    
+    return _json_response({'jobs': results})
+
+
+def _audit_kwargs(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract run_audit_sync arguments from an audit request body, applying defaults"""
+    return _parse_request(data, AUDIT_REQUEST_FIELDS)
+
+
+def _run_batch_job(job: Any) -> Dict[str, Any]:
+    """Run one /api/audit/batch job, returning its result or an error entry"""
     try:
-        # Get request data
-        data = request.get_json() or {}
-        
-        # Extract parameters with defaults
-        user_role_arn = data.get('user_role_arn')
-        external_id = data.get('external_id')
-        organization = data.get('organization', False)
-        regions = data.get('regions', ['us-east-1'])
-        max_workers = data.get('max_workers', 5)
-        cross_account_role = data.get('cross_account_role', 'OrganizationAccountAccessRole')
-        org_admin_account_id = data.get('org_admin_account_id')
-        profile = data.get('profile', 'default')
-        config_file = data.get('config_file')
-        
-        # Validate regions is a list
-        if not isinstance(regions, list):
-            return jsonify({
-                'error': 'regions must be a list of region names'
-            }), 400
-        
-        # Run the audit
-        result = run_audit_sync(
-            organization=organization,
-            regions=regions,
-            max_workers=max_workers,
-            cross_account_role=cross_account_role,
-            org_admin_account_id=org_admin_account_id,
-            profile=profile,
-            config_file=config_file,
-            user_role_arn=user_role_arn,
-            external_id=external_id
-        )
-        
-        return jsonify(result)
-        
+        if not isinstance(job, dict):
+            raise RequestValidationError('each job must be a JSON object')
+        return run_audit_sync(**_audit_kwargs(job))
     except Exception as e:
-        # Return error details
-        import os
-        debug_mode = os.environ.get('DEBUG', 'false').lower() == 'true'
-        
-        error_response = {
-            'error': str(e),
-            'type': type(e).__name__
-        }
-        
-        # Only include traceback in debug mode to avoid leaking system information
-        if debug_mode:
-            error_response['traceback'] = traceback.format_exc()
-        
-        return jsonify(error_response), 500
+        return _error_body(e)
 
 
 @app.route('/api/costs', methods=['POST'])
+@_handle_errors
 def get_costs():
     """
     Get cost analysis by AWS service.
@@ -401,39 +975,35 @@ def get_costs():
         "period": "MONTHLY"  // DAILY, WEEKLY, or MONTHLY
     }
     """
-    try:
-        from kosty.services.cost_explorer_audit import CostExplorerAuditService
-        import boto3
-        
-        data = request.get_json() or {}
-        user_role_arn = data.get('user_role_arn')
-        external_id = data.get('external_id')
-        regions = data.get('regions', ['us-east-1'])
-        period = data.get('period', 'MONTHLY')
-        
-        # Create session
-        session = _create_session(user_role_arn, external_id)
-        
-        # Run cost analysis
-        service = CostExplorerAuditService()
-        results = []
-        
-        for region in regions:
-            cost_data = service.analyze_costs_by_service(session, region, period=period)
-            results.extend(cost_data)
-        
-        return jsonify({
-            'period': period,
-            'regions': regions,
-            'costs': results,
-            'total_services': len(results)
-        })
+    req = _parse_request(_request_json(), COSTS_REQUEST_FIELDS)
+    user_role_arn = req['user_role_arn']
+    external_id = req['external_id']
+    regions = req['regions']
+    period = req['period']
     
-    except Exception as e:
-        return _handle_error(e)
+    # Create session
+    session = _create_session(user_role_arn, external_id)
+    
+    # Run cost analysis
+    service = _cost_explorer_service
+    results = _collect_by_region(
+        lambda region: _rate_limited(
+            'ce', user_role_arn,
+            lambda: service.analyze_costs_by_service(session, region, period=period)
+        ),
+        regions
+    )
+    
+    return _json_response({
+        'period': period,
+        'regions': regions,
+        'costs': results,
+        'total_services': len(results)
+    })
 
 
 @app.route('/api/costs/trends', methods=['POST'])
+@_handle_errors
 def get_cost_trends():
     """
     Get cost trends over time for specific services.
@@ -446,30 +1016,28 @@ def get_cost_trends():
         "days": 30  // Number of days to analyze
     }
     """
-    try:
-        from kosty.services.cost_explorer_audit import CostExplorerAuditService
-        
-        data = request.get_json() or {}
-        user_role_arn = data.get('user_role_arn')
-        external_id = data.get('external_id')
-        days = data.get('days', 30)
-        
-        session = _create_session(user_role_arn, external_id)
-        
-        # Get cost trends (use daily granularity for trends)
-        service = CostExplorerAuditService()
-        results = service.analyze_costs_by_service(session, 'us-east-1', period='DAILY')
-        
-        return jsonify({
-            'days': days,
-            'trends': results
-        })
+    req = _parse_request(_request_json(), COST_TRENDS_REQUEST_FIELDS)
+    user_role_arn = req['user_role_arn']
+    external_id = req['external_id']
+    days = req['days']
     
-    except Exception as e:
-        return _handle_error(e)
+    session = _create_session(user_role_arn, external_id)
+    
+    # Get cost trends (use daily granularity for trends)
+    service = _cost_explorer_service
+    results = _rate_limited(
+        'ce', user_role_arn,
+        lambda: service.analyze_costs_by_service(session, 'us-east-1', period='DAILY')
+    )
+    
+    return _json_response({
+        'days': days,
+        'trends': results
+    })
 
 
 @app.route('/api/costs/anomalies', methods=['POST'])
+@_handle_errors
 def detect_anomalies():
     """
     Detect cost anomalies using AWS Cost Anomaly Detection.
@@ -480,28 +1048,26 @@ def detect_anomalies():
         "external_id": "unique-external-id"
     }
     """
-    try:
-        from kosty.services.cost_explorer_audit import CostExplorerAuditService
-        
-        data = request.get_json() or {}
-        user_role_arn = data.get('user_role_arn')
-        external_id = data.get('external_id')
-        
-        session = _create_session(user_role_arn, external_id)
-        
-        service = CostExplorerAuditService()
-        anomalies = service.detect_cost_anomalies(session, 'us-east-1')
-        
-        return jsonify({
-            'anomalies': anomalies,
-            'total_anomalies': len(anomalies)
-        })
+    req = _parse_request(_request_json(), ROLE_FIELDS)
+    user_role_arn = req['user_role_arn']
+    external_id = req['external_id']
     
-    except Exception as e:
-        return _handle_error(e)
+    session = _create_session(user_role_arn, external_id)
+    
+    service = _cost_explorer_service
+    anomalies = _rate_limited(
+        'ce', user_role_arn,
+        lambda: service.detect_cost_anomalies(session, 'us-east-1')
+    )
+    
+    return _json_response({
+        'anomalies': anomalies,
+        'total_anomalies': len(anomalies)
+    })
 
 
 @app.route('/api/budgets', methods=['POST'])
+@_handle_errors
 def check_budgets():
     """
     Check AWS Budget thresholds.
@@ -512,28 +1078,23 @@ def check_budgets():
         "external_id": "unique-external-id"
     }
     """
-    try:
-        from kosty.services.cost_explorer_audit import CostExplorerAuditService
-        
-        data = request.get_json() or {}
-        user_role_arn = data.get('user_role_arn')
-        external_id = data.get('external_id')
-        
-        session = _create_session(user_role_arn, external_id)
-        
-        service = CostExplorerAuditService()
-        budget_alerts = service.check_budget_thresholds(session, 'us-east-1')
-        
-        return jsonify({
-            'budget_alerts': budget_alerts,
-            'total_alerts': len(budget_alerts)
-        })
+    req = _parse_request(_request_json(), ROLE_FIELDS)
+    user_role_arn = req['user_role_arn']
+    external_id = req['external_id']
     
-    except Exception as e:
-        return _handle_error(e)
+    session = _create_session(user_role_arn, external_id)
+    
+    service = _cost_explorer_service
+    budget_alerts = service.check_budget_thresholds(session, 'us-east-1')
+    
+    return _json_response({
+        'budget_alerts': budget_alerts,
+        'total_alerts': len(budget_alerts)
+    })
 
 
 @app.route('/api/guardduty', methods=['POST'])
+@_handle_errors
 def check_guardduty():
     """
     Check GuardDuty status and get high-severity findings.
@@ -546,40 +1107,34 @@ def check_guardduty():
         "days": 30  // Days to look back for findings
     }
     """
-    try:
-        from kosty.services.guardduty_audit import GuardDutyAuditService
-        
-        data = request.get_json() or {}
-        user_role_arn = data.get('user_role_arn')
-        external_id = data.get('external_id')
-        regions = data.get('regions', ['us-east-1'])
-        days = data.get('days', 30)
-        
-        session = _create_session(user_role_arn, external_id)
-        
-        service = GuardDutyAuditService()
-        all_findings = []
-        
-        for region in regions:
-            findings = service.audit(session, region, days=days)
-            all_findings.extend(findings)
-        
-        # Separate status and findings
-        status_info = [f for f in all_findings if f.get('check') in ['guardduty_enabled', 'guardduty_status']]
-        security_findings = [f for f in all_findings if f.get('check') == 'guardduty_finding']
-        
-        return jsonify({
-            'regions': regions,
-            'status': status_info,
-            'findings': security_findings,
-            'total_findings': len(security_findings)
-        })
+    req = _parse_request(_request_json(), GUARDDUTY_REQUEST_FIELDS)
+    user_role_arn = req['user_role_arn']
+    external_id = req['external_id']
+    regions = req['regions']
+    days = req['days']
     
-    except Exception as e:
-        return _handle_error(e)
+    session = _create_session(user_role_arn, external_id)
+    
+    service = _guardduty_service
+    all_findings = _collect_by_region(
+        lambda region: service.audit(session, region, days=days),
+        regions
+    )
+    
+    # Separate status and findings
+    status_info = [f for f in all_findings if f.get('check') in ['guardduty_enabled', 'guardduty_status']]
+    security_findings = [f for f in all_findings if f.get('check') == 'guardduty_finding']
+    
+    return _json_response({
+        'regions': regions,
+        'status': status_info,
+        'findings': security_findings,
+        'total_findings': len(security_findings)
+    })
 
 
 @app.route('/api/alerts/feed', methods=['POST'])
+@_handle_errors
 def get_alert_feed():
     """
     Get aggregated alert feed.
@@ -594,54 +1149,51 @@ def get_alert_feed():
         "severity_min": "medium"  // Optional: minimum severity
     }
     """
-    try:
-        data = request.get_json() or {}
-        user_role_arn = data.get('user_role_arn')
-        external_id = data.get('external_id')
-        regions = data.get('regions', ['us-east-1'])
-        feed_type = data.get('feed_type', 'daily')
-        alert_types = data.get('alert_types')
-        severity_min = data.get('severity_min')
-        
-        # Run a comprehensive audit to get all findings
-        result = run_audit_sync(
-            organization=False,
-            regions=regions,
-            max_workers=5,
-            user_role_arn=user_role_arn,
-            external_id=external_id
+    req = _parse_request(_request_json(), ALERT_FEED_REQUEST_FIELDS)
+    user_role_arn = req['user_role_arn']
+    external_id = req['external_id']
+    regions = req['regions']
+    feed_type = req['feed_type']
+    alert_types = req['alert_types']
+    severity_min = req['severity_min']
+    
+    # Reuse a recent audit if there is one, otherwise run a comprehensive audit
+    result = run_audit_cached(
+        organization=False,
+        regions=regions,
+        max_workers=5,
+        user_role_arn=user_role_arn,
+        external_id=external_id
+    )
+    
+    # Aggregate alerts
+    alert_service = _alert_feed_service
+    alerts = alert_service.aggregate_alerts(result['results'])
+    
+    # Filter if requested
+    if alert_types or severity_min:
+        alerts = alert_service.filter_alerts(
+            alerts, 
+            alert_types=alert_types,
+            severity_min=severity_min
         )
-        
-        # Aggregate alerts
-        alert_service = AlertFeedService()
-        alerts = alert_service.aggregate_alerts(result['results'])
-        
-        # Filter if requested
-        if alert_types or severity_min:
-            alerts = alert_service.filter_alerts(
-                alerts, 
-                alert_types=alert_types,
-                severity_min=severity_min
-            )
-        
-        # Generate feed
-        if feed_type == 'daily':
-            feed = alert_service.generate_daily_feed(alerts)
-        else:
-            feed = {
-                'feed_type': 'realtime',
-                'generated_at': datetime.now().isoformat(),
-                'summary': alert_service.get_alert_summary(alerts),
-                'alerts': alerts
-            }
-        
-        return jsonify(feed)
     
-    except Exception as e:
-        return _handle_error(e)
+    # Generate feed
+    if feed_type == 'daily':
+        feed = alert_service.generate_daily_feed(alerts)
+    else:
+        feed = {
+            'feed_type': 'realtime',
+            'generated_at': datetime.now().isoformat(),
+            'summary': alert_service.get_alert_summary(alerts),
+            'alerts': alerts
+        }
+    
+    return _json_response(feed)
 
 
 @app.route('/api/alerts/summary', methods=['POST'])
+@_handle_errors
 def get_alert_summary():
     """
     Get summary statistics for alerts.
@@ -653,33 +1205,30 @@ def get_alert_summary():
         "regions": ["us-east-1"]
     }
     """
-    try:
-        data = request.get_json() or {}
-        user_role_arn = data.get('user_role_arn')
-        external_id = data.get('external_id')
-        regions = data.get('regions', ['us-east-1'])
-        
-        # Run audit
-        result = run_audit_sync(
-            organization=False,
-            regions=regions,
-            max_workers=5,
-            user_role_arn=user_role_arn,
-            external_id=external_id
-        )
-        
-        # Get alert summary
-        alert_service = AlertFeedService()
-        alerts = alert_service.aggregate_alerts(result['results'])
-        summary = alert_service.get_alert_summary(alerts)
-        
-        return jsonify(summary)
+    req = _parse_request(_request_json(), ALERT_SUMMARY_REQUEST_FIELDS)
+    user_role_arn = req['user_role_arn']
+    external_id = req['external_id']
+    regions = req['regions']
     
-    except Exception as e:
-        return _handle_error(e)
+    # Reuse a recent audit if there is one, otherwise run audit
+    result = run_audit_cached(
+        organization=False,
+        regions=regions,
+        max_workers=5,
+        user_role_arn=user_role_arn,
+        external_id=external_id
+    )
+    
+    # Get alert summary
+    alert_service = _alert_feed_service
+    alerts = alert_service.aggregate_alerts(result['results'])
+    summary = alert_service.get_alert_summary(alerts)
+    
+    return _json_response(summary)
 
 
 @app.route('/api/alerts/configure', methods=['POST'])
+@_handle_errors
 def configure_alerts():
     """
     Configure alert thresholds (stored in memory for this session).
@@ -691,86 +1240,263 @@ def configure_alerts():
         "idle_days_threshold": 7
     }
     """
-    try:
-        data = request.get_json() or {}
+    # In a production system, these would be persisted to a database
+    # For now, we'll just return the configuration
+    config = _parse_request(_request_json(), ALERT_CONFIG_REQUEST_FIELDS)
+    config['configured_at'] = datetime.now().isoformat()
+    
+    return _json_response({
+        'message': 'Alert thresholds configured',
+        'configuration': config
+    })
+
+
+def _json_default(obj):
+    """
+    Encode the types JSON has no native form for. Datetimes are always ISO 8601
+    (naive ones taken as UTC), whichever encoder is in use.
+    """
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return obj.isoformat()
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if orjson is None:
+        return app.json.default(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode obj as JSON bytes, with orjson when installed (else Flask's encoder)"""
+    if orjson is None:
+        return app.json.dumps(obj, default=_json_default).encode('utf-8')
+    
+    return orjson.dumps(
+        obj,
+        default=_json_default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    )
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Encode obj as one NDJSON line"""
+    return _dumps(obj) + b'\n'
+
+
+def _json_response(obj: Any, status: int = 200):
+    """Serialize obj with _dumps() into a JSON response"""
+    return app.response_class(_dumps(obj), status=status, mimetype='application/json')
+
+
+def _static_json_response(body: str, etag: Optional[str] = None):
+    """
+    Wrap a pre-encoded JSON body in a fresh Response. Bodies with an ETag are
+    publicly cacheable and answered with 304 when the client already has them.
+    """
+    response = app.response_class(body, mimetype='application/json')
+    if etag:
+        response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+        response.set_etag(etag)
+        response = response.make_conditional(request)
+    return response
+
+
+def _collect_by_region(fetch, regions: list) -> list:
+    """
+    Call fetch(region) for every region concurrently and concatenate the
+    returned lists in region order.
+    """
+    if len(regions) <= 1:
+        return [item for region in regions for item in fetch(region)]
+    
+    with ThreadPoolExecutor(max_workers=min(len(regions), MAX_REGION_WORKERS)) as executor:
+        per_region = list(executor.map(fetch, regions))
+    
+    return [item for items in per_region for item in items]
+
+
+def _get_sts_client():
+    """Return the STS client shared across requests, creating it on first use"""
+    global _sts_client
+    
+    if _sts_client is None:
+        with _sts_client_lock:
+            if _sts_client is None:
+                _sts_client = boto3.client('sts', config=AWS_CLIENT_CONFIG)
+    
+    return _sts_client
+
+
+def _get_caller_identity() -> Dict[str, Any]:
+    """Return the API server's STS caller identity, looked up once and then cached"""
+    global _caller_identity, _caller_identity_error
+    
+    if _caller_identity is not None:
+        return _caller_identity
+    
+    with _caller_identity_lock:
+        if _caller_identity is not None:
+            return _caller_identity
         
-        # In a production system, these would be persisted to a database
-        # For now, we'll just return the configuration
-        config = {
-            'budget_threshold_percentage': data.get('budget_threshold_percentage', 80),
-            'cost_spike_threshold': data.get('cost_spike_threshold', 100),
-            'idle_days_threshold': data.get('idle_days_threshold', 7),
-            'configured_at': datetime.now().isoformat()
-        }
+        if _caller_identity_error and time.monotonic() - _caller_identity_error[1] < CALLER_IDENTITY_RETRY:
+            raise _caller_identity_error[0]
         
-        return jsonify({
-            'message': 'Alert thresholds configured',
-            'configuration': config
-        })
-    
-    except Exception as e:
-        return _handle_error(e)
+        try:
+            _caller_identity = _get_sts_client().get_caller_identity()
+        except Exception as e:
+            _caller_identity_error = (e, time.monotonic())
+            raise
+        
+        _caller_identity_error = None
+        return _caller_identity
 
 
-def _create_session(user_role_arn: str, external_id: str = None):
-    """Helper to create AWS session with role assumption"""
-    import boto3
+def _get_role_credentials(user_role_arn: str, external_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return temporary credentials for user_role_arn, reusing cached ones
+    until CREDENTIALS_REFRESH_MARGIN seconds before they expire.
+    Concurrent requests for the same role wait for a single AssumeRole call.
+    """
+    key = (user_role_arn, external_id)
+    credentials = _cached_role_credentials(key)
+    if credentials:
+        return credentials
     
-    if user_role_arn:
-        sts = boto3.client('sts')
+    with _assume_role_locks[hash(key) % len(_assume_role_locks)]:
+        # Another request may have refreshed the credentials while we waited
+        credentials = _cached_role_credentials(key)
+        if credentials:
+            return credentials
+        
+        sts = _get_sts_client()
         assume_role_params = {
             'RoleArn': user_role_arn,
-            'RoleSessionName': 'kosty-api-request',
+            'RoleSessionName': 'kosty-api',
             'DurationSeconds': 3600
         }
+        
+        # Add external ID if provided for additional security
         if external_id:
             assume_role_params['ExternalId'] = external_id
         
-        response = sts.assume_role(**assume_role_params)
-        return boto3.Session(
-            aws_access_key_id=response['Credentials']['AccessKeyId'],
-            aws_secret_access_key=response['Credentials']['SecretAccessKey'],
-            aws_session_token=response['Credentials']['SessionToken']
-        )
-    else:
-        return boto3.Session()
+        credentials = _rate_limited('sts', None, lambda: sts.assume_role(**assume_role_params))['Credentials']
+        
+        with _credentials_lock:
+            _credentials_cache[key] = credentials
+            _credentials_cache.move_to_end(key)
+            while len(_credentials_cache) > CREDENTIALS_CACHE_SIZE:
+                _credentials_cache.popitem(last=False)
+    
+    return credentials
 
 
-def _handle_error(e: Exception):
-    """Helper to handle and format errors"""
-    import os
-    debug_mode = os.environ.get('DEBUG', 'false').lower() == 'true'
+def _cached_role_credentials(key: Tuple[str, Optional[str]]) -> Optional[Dict[str, Any]]:
+    """Return cached credentials for key if they are not about to expire"""
+    with _credentials_lock:
+        credentials = _credentials_cache.get(key)
+        if credentials:
+            _credentials_cache.move_to_end(key)
     
-    error_response = {
-        'error': str(e),
-        'type': type(e).__name__
-    }
+    if credentials:
+        remaining = (credentials['Expiration'] - datetime.now(timezone.utc)).total_seconds()
+        if remaining > CREDENTIALS_REFRESH_MARGIN:
+            return credentials
     
-    if debug_mode:
-        error_response['traceback'] = traceback.format_exc()
+    return None
+
+
+class _ClientCachingSession(boto3.Session):
+    """
+    boto3 Session that builds each (service, region) client once and hands the
+    same client to every caller. Clients are thread-safe; creating them is
+    not, so creation is serialized.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+    
+    def client(self, service_name, region_name=None, **kwargs):
+        # Clients with custom arguments (endpoint, config, ...) are not shared,
+        # but are still created under the lock
+        if kwargs:
+            with self._clients_lock:
+                return super().client(service_name, region_name=region_name, **kwargs)
+        
+        key = (service_name, region_name)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = super().client(service_name, region_name=region_name)
+                self._clients[key] = client
+        
+        return client
+
+
+def _new_session(**kwargs):
+    """
+    Create a boto3 Session whose clients default to AWS_CLIENT_CONFIG.
+    Services build their own clients from the session, so the config is set
+    on the underlying botocore session (explicit client configs are merged on top).
+    """
+    core_session = botocore.session.get_session()
+    core_session.register_component('data_loader', _data_loader)
+    core_session.set_default_client_config(AWS_CLIENT_CONFIG)
+    return _ClientCachingSession(botocore_session=core_session, **kwargs)
+
+
+def _session_from_credentials(credentials: Dict[str, Any]):
+    """Build a boto3 Session from an STS Credentials dict"""
+    return _new_session(
+        aws_access_key_id=credentials['AccessKeyId'],
+        aws_secret_access_key=credentials['SecretAccessKey'],
+        aws_session_token=credentials['SessionToken']
+    )
+
+
+def _create_session(user_role_arn: str, external_id: str = None):
+    """
+    Helper to create AWS session with role assumption.
+    Sessions (and the clients built from them) are reused across requests
+    for the same role until its credentials are refreshed.
+    """
+    global _default_session
+    
+    if not user_role_arn:
+        with _sessions_lock:
+            if _default_session is None:
+                _default_session = _new_session()
+            return _default_session
+    
+    credentials = _get_role_credentials(user_role_arn, external_id)
+    key = (user_role_arn, external_id)
     
-    return jsonify(error_response), 500
+    with _sessions_lock:
+        cached = _session_cache.get(key)
+        if cached and cached[0] == credentials['AccessKeyId']:
+            _session_cache.move_to_end(key)
+            return cached[1]
+        
+        session = _session_from_credentials(credentials)
+        _session_cache[key] = (credentials['AccessKeyId'], session)
+        _session_cache.move_to_end(key)
+        while len(_session_cache) > SESSION_CACHE_SIZE:
+            _session_cache.popitem(last=False)
+    
+    return session
 
 
 def main():
     """Run the Flask development server"""
     port = int(os.environ.get('PORT', 5000))
     host = os.environ.get('HOST', '0.0.0.0')
-    debug = os.environ.get('DEBUG', 'false').lower() == 'true'
-    
-    print(f"""
-╔════════════════════════════════════════════════════╗
-║       Kosty API Server Starting                    ║
-╠════════════════════════════════════════════════════╣
-║  🌐 Host: {host:<38s} ║
-║  🔌 Port: {str(port):<38s} ║
-║  🐛 Debug: {str(debug):<37s} ║
-╠════════════════════════════════════════════════════╣
-║  📚 Docs: http://{host}:{port}/<{' ' * max(0, 22 - len(host) - len(str(port)))} ║
-║  🏥 Health: http://{host}:{port}/health<{' ' * max(0, 16 - len(host) - len(str(port)))} ║
-║  🔍 Audit: POST http://{host}:{port}/api/audit<{' ' * max(0, 10 - len(host) - len(str(port)))} ║
-╚════════════════════════════════════════════════════╝
-    """)
+    debug = DEBUG
+    
+    print(f"Kosty API Server starting on http://{host}:{port}/ (debug={debug})", flush=True)
     
     app.run(host=host, port=port, debug=debug)
 
@@ -2,8 +2,52 @@
 Alert Feed Service - Aggregates and manages alerts from all sources
 """
 from typing import List, Dict, Any
+from collections import Counter
+from concurrent.futures import Executor
 from datetime import datetime, timedelta
-import json
+from functools import lru_cache
+import heapq
+import itertools
+import re
+
+# Numeric priority per severity, used for sorting and filtering
+_SEV_PRI = {
+    'critical': 5,
+    'high': 4,
+    'medium': 3,
+    'low': 2,
+    'info': 1
+}
+_SEV_PRI_GET = _SEV_PRI.get
+
+# Classifies a lowercased check name in one scan. Branches are tried in
+# priority order, so group 1 = anomaly, 2 = budget threshold, 3 = idle.
+_CHECK_TYPE_RE = re.compile(
+    r'^(?:(?=.*(anomaly))'
+    r'|(?=.*budget)(?=.*(threshold))'
+    r'|(?=.*(idle|unused|stopped|empty|orphan|unattached)))',
+    re.DOTALL
+)
+_CHECK_TYPES = {1: 'cost_anomaly', 2: 'budget_threshold', 3: 'idle_resource'}
+
+# Severity step in the composite sort key; larger than any monthly cost
+_SEV_WEIGHT = 1e12
+
+# Marks a key absent from a finding, so fallbacks only apply to missing keys
+_MISSING = object()
+
+# Fallback id sequence for alerts created outside aggregate_alerts
+_alert_counter = itertools.count()
+
+
+@lru_cache(maxsize=1024)
+def _iso_to_ts(timestamp: str) -> float:
+    """
+    Epoch seconds of an alert's ISO timestamp. Alerts of one batch share the
+    same timestamp string, so date filters parse it once per batch rather
+    than once per alert.
+    """
+    return datetime.fromisoformat(timestamp).timestamp()
 
 class AlertFeedService:
     """
@@ -20,23 +64,66 @@ class AlertFeedService:
             'combined': 'Combined Cost & Security'
         }
     
-    def aggregate_alerts(self, all_findings: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def aggregate_alerts(self, all_findings: Dict[str, Any], executor: Executor = None,
+                         top_k: int = None) -> List[Dict[str, Any]]:
         """
         Aggregate alerts from all audit results into a unified feed.
         
         Args:
             all_findings: Dictionary of all findings from comprehensive scan
+            executor: Optional executor (e.g. a ProcessPoolExecutor) used to
+                build alerts for several accounts in parallel
+            top_k: Only return the K highest-priority alerts
             
         Returns:
             List of aggregated alerts sorted by priority
         """
         alerts = []
-        
-        # Process findings from each account
+        sort_keys = []
+        
+        # One timestamp for the whole batch; per-account counters keep alert ids unique
+        now = datetime.now()
+        now_iso = now.isoformat()
+        
+        # Accounts share no state until the final sort, so they can be built independently
+        account_ids = list(all_findings)
+        if executor is not None and len(account_ids) > 1:
+            parts = executor.map(
+                _aggregate_account,
+                itertools.repeat(self),
+                account_ids,
+                [all_findings[a] for a in account_ids],
+                itertools.repeat(now_iso)
+            )
+        else:
+            parts = (
+                _aggregate_account(self, account_id, all_findings[account_id], now_iso)
+                for account_id in account_ids
+            )
+        
+        for account_alerts, account_keys in parts:
+            alerts.extend(account_alerts)
+            sort_keys.extend(account_keys)
+        
+        # Sort alerts by priority (severity and cost impact) using the
+        # precomputed keys, then materialize the ordered list once.
+        # A partial sort is enough when only the top K are wanted.
+        if top_k is not None and top_k < len(alerts):
+            order = heapq.nlargest(top_k, range(len(alerts)), key=sort_keys.__getitem__)
+        else:
+            order = sorted(range(len(alerts)), key=sort_keys.__getitem__, reverse=True)
+        
+        return [alerts[i] for i in order]
+    
+    @staticmethod
+    def _iter_findings(all_findings: Dict[str, Any]):
+        """
+        Flatten scan results into (account_id, service, finding) tuples.
+        """
         for account_id, account_findings in all_findings.items():
             for service, service_findings in account_findings.items():
                 # Each service can have multiple check types
-                for check_type, check_results in service_findings.items():
+                for check_results in service_findings.values():
                     if isinstance(check_results, dict) and 'items' in check_results:
                         items = check_results['items']
                     elif isinstance(check_results, list):
@@ -45,20 +132,11 @@ class AlertFeedService:
                         continue
                     
                     for item in items:
-                        alert = self._create_alert_from_finding(item, account_id, service)
-                        if alert:
-                            alerts.append(alert)
-        
-        # Sort alerts by priority (severity and cost impact)
-        alerts.sort(key=lambda x: (
-            self._severity_priority(x.get('severity', 'low')),
-            x.get('monthly_cost', 0)
-        ), reverse=True)
-        
-        return alerts
+                        yield account_id, service, item
     
     def _create_alert_from_finding(self, finding: Dict[str, Any], 
-                                   account_id: str, service: str) -> Dict[str, Any]:
+                                   account_id: str, service: str,
+                                   now_iso: str = None, counter=None) -> Dict[str, Any]:
         """
         Convert a finding into a standardized alert format.
         """
@@ -68,24 +146,44 @@ class AlertFeedService:
         if not alert_type:
             return None
         
-        # Create standardized alert
+        if now_iso is None:
+            now_iso = datetime.now().isoformat()
+        if counter is None:
+            counter = _alert_counter
+        
+        get = finding.get
+        resource_id = get('resource_id', 'unknown')
+        
+        # Fallback fields are only looked up when the primary key is absent
+        region = get('Region', _MISSING)
+        if region is _MISSING:
+            region = get('region', 'unknown')
+        recommendation = get('Recommendation', _MISSING)
+        if recommendation is _MISSING:
+            recommendation = get('Action', '')
+        details = get('Details', _MISSING)
+        if details is _MISSING:
+            details = {}
+        
+        # Create standardized alert (a plain dict literal: it is the shape
+        # the API returns and the cheapest mapping to build)
         alert = {
-            'alert_id': f"{account_id}-{service}-{finding.get('resource_id', 'unknown')}-{datetime.now().timestamp()}",
-            'timestamp': datetime.now().isoformat(),
+            'alert_id': f"{account_id}-{service}-{resource_id}-{next(counter)}",
+            'timestamp': now_iso,
             'account_id': account_id,
             'service': service,
             'alert_type': alert_type,
             'alert_type_label': self.alert_types.get(alert_type, 'Unknown'),
-            'severity': finding.get('severity', 'medium'),
-            'title': finding.get('Issue', 'Unknown Issue'),
+            'severity': str(get('severity', 'medium')).lower(),
+            'title': get('Issue', 'Unknown Issue'),
             'description': self._format_description(finding),
-            'resource_id': finding.get('resource_id', 'unknown'),
-            'resource_name': finding.get('resource_name', 'Unknown'),
-            'region': finding.get('Region', finding.get('region', 'unknown')),
-            'monthly_cost': finding.get('monthly_cost', finding.get('monthly_savings', 0)),
-            'recommendation': finding.get('Recommendation', finding.get('Action', '')),
-            'details': finding.get('Details', {}),
-            'check': finding.get('check', 'unknown')
+            'resource_id': resource_id,
+            'resource_name': get('resource_name', 'Unknown'),
+            'region': region,
+            'monthly_cost': get('monthly_cost', get('monthly_savings', 0)),
+            'recommendation': recommendation,
+            'details': details,
+            'check': get('check', 'unknown')
         }
         
         return alert
@@ -103,20 +201,13 @@ class AlertFeedService:
             return 'combined'
         
         # Security alerts
-        if finding_type == 'security' and severity in ['high', 'critical']:
+        if finding_type == 'security' and severity in ('high', 'critical'):
             return 'security_high'
         
-        # Cost-related alerts
-        if 'anomaly' in check:
-            return 'cost_anomaly'
-        
-        if 'budget' in check and 'threshold' in check:
-            return 'budget_threshold'
-        
-        # Idle/unused resources
-        idle_patterns = ['idle', 'unused', 'stopped', 'empty', 'orphan', 'unattached']
-        if any(pattern in check for pattern in idle_patterns):
-            return 'idle_resource'
+        # Cost anomalies, budget thresholds and idle/unused resources
+        match = _CHECK_TYPE_RE.match(check)
+        if match:
+            return _CHECK_TYPES[match.lastindex]
         
         # Cost spikes (high cost items)
         if finding_type == 'cost' and finding.get('monthly_cost', 0) > 100:
@@ -129,14 +220,7 @@ class AlertFeedService:
         """
         Convert severity to numeric priority for sorting.
         """
-        priorities = {
-            'critical': 5,
-            'high': 4,
-            'medium': 3,
-            'low': 2,
-            'info': 1
-        }
-        return priorities.get(severity.lower(), 0)
+        return _SEV_PRI_GET(severity.lower() if severity else '', 0)
     
     def _format_description(self, finding: Dict[str, Any]) -> str:
         """
@@ -174,55 +258,92 @@ class AlertFeedService:
             severity_min: Minimum severity level (low, medium, high, critical)
             days: Only include alerts from last N days
         """
-        filtered = alerts
+        predicates = self._alert_predicates(alert_types, severity_min, days)
+        
+        if not predicates:
+            return alerts
+        
+        return list(self._iter_matching(alerts, predicates))
+    
+    def iter_filter_alerts(self, alerts: List[Dict[str, Any]], 
+                           alert_types: List[str] = None,
+                           severity_min: str = None,
+                           days: int = None):
+        """
+        Generator version of filter_alerts() for callers that only iterate
+        the result once, so no filtered copy of the list is built.
+        """
+        predicates = self._alert_predicates(alert_types, severity_min, days)
+        
+        if not predicates:
+            return iter(alerts)
+        
+        return self._iter_matching(alerts, predicates)
+    
+    def _alert_predicates(self, alert_types: List[str] = None,
+                          severity_min: str = None,
+                          days: int = None) -> list:
+        """
+        Build the predicates for the requested filters. The most selective
+        checks come first so each alert is rejected as early as possible:
+        recent-only, then type membership, then severity floor.
+        """
+        predicates = []
+        
+        if days:
+            cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
+            predicates.append(lambda a: _iso_to_ts(a.get('timestamp', '')) >= cutoff_ts)
         
-        # Filter by alert type
         if alert_types:
-            filtered = [a for a in filtered if a.get('alert_type') in alert_types]
+            wanted_types = frozenset(alert_types)
+            predicates.append(lambda a: a.get('alert_type') in wanted_types)
         
-        # Filter by severity
         if severity_min:
             min_priority = self._severity_priority(severity_min)
-            filtered = [a for a in filtered if self._severity_priority(a.get('severity', 'low')) >= min_priority]
-        
-        # Filter by date
-        if days:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            filtered = [a for a in filtered if datetime.fromisoformat(a.get('timestamp', '')) >= cutoff_date]
+            # Alert severities are lowercased when the alert is created
+            sev = _SEV_PRI_GET
+            predicates.append(lambda a: sev(a.get('severity', 'low'), 0) >= min_priority)
         
-        return filtered
+        return predicates
+    
+    @staticmethod
+    def _iter_matching(alerts, predicates):
+        """
+        Yield the alerts that pass every predicate, stopping at the first failure.
+        """
+        for alert in alerts:
+            for predicate in predicates:
+                if not predicate(alert):
+                    break
+            else:
+                yield alert
     
     def get_alert_summary(self, alerts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Generate summary statistics for alerts.
         """
-        summary = {
-            'total_alerts': len(alerts),
-            'by_type': {},
-            'by_severity': {},
-            'by_service': {},
-            'total_monthly_cost_impact': 0,
-            'top_alerts': []
-        }
+        by_type = Counter()
+        by_severity = Counter()
+        by_service = Counter()
+        total_cost = 0
         
+        # Single pass over the alerts for all counters and the cost total
         for alert in alerts:
-            # Count by type
-            alert_type = alert.get('alert_type', 'unknown')
-            summary['by_type'][alert_type] = summary['by_type'].get(alert_type, 0) + 1
-            
-            # Count by severity
-            severity = alert.get('severity', 'unknown')
-            summary['by_severity'][severity] = summary['by_severity'].get(severity, 0) + 1
-            
-            # Count by service
-            service = alert.get('service', 'unknown')
-            summary['by_service'][service] = summary['by_service'].get(service, 0) + 1
-            
-            # Sum cost impact
-            summary['total_monthly_cost_impact'] += alert.get('monthly_cost', 0)
+            get = alert.get
+            by_type[get('alert_type', 'unknown')] += 1
+            by_severity[get('severity', 'unknown')] += 1
+            by_service[get('service', 'unknown')] += 1
+            total_cost += get('monthly_cost', 0)
         
-        # Get top 10 alerts by priority
-        summary['top_alerts'] = alerts[:10]
+        summary = {
+            'total_alerts': len(alerts),
+            'by_type': dict(by_type),
+            'by_severity': dict(by_severity),
+            'by_service': dict(by_service),
+            'total_monthly_cost_impact': total_cost,
+            # Top 10 alerts by priority
+            'top_alerts': alerts[:10]
+        }
         
         return summary
     
@@ -233,10 +354,13 @@ class AlertFeedService:
         # Filter to last 24 hours
         daily_alerts = self.filter_alerts(alerts, days=1)
         
+        # Read the clock once; the date is a prefix of the ISO timestamp
+        generated_at = datetime.now().isoformat()
+        
         feed = {
-            'feed_date': datetime.now().strftime('%Y-%m-%d'),
+            'feed_date': generated_at[:10],
             'feed_type': 'daily',
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': generated_at,
             'summary': self.get_alert_summary(daily_alerts),
             'alerts': daily_alerts,
             'recommendations': self._generate_recommendations(daily_alerts)
@@ -276,3 +400,36 @@ class AlertFeedService:
             recommendations.append("⚠️ Budget thresholds exceeded - review spending immediately")
         
         return recommendations
+
+
+def _priority_key(severity_priority: int, cost: Any) -> float:
+    """
+    Fold (severity priority, monthly cost) into one float that orders the
+    same way, so sorting compares plain floats instead of tuples.
+    """
+    try:
+        cost = float(cost or 0)
+    except (TypeError, ValueError):
+        cost = 0.0
+    return severity_priority * _SEV_WEIGHT + cost
+
+
+def _aggregate_account(feed: AlertFeedService, account_id: str, account_findings: Dict[str, Any],
+                       now_iso: str):
+    """
+    Build the alerts and their sort keys for a single account.
+    Module-level so it can be shipped to a worker process.
+    """
+    alerts = []
+    sort_keys = []
+    sev = _SEV_PRI_GET
+    counter = itertools.count()
+    
+    # Single pass: build each alert and its sort key side by side
+    for _, service, item in feed._iter_findings({account_id: account_findings}):
+        alert = feed._create_alert_from_finding(item, account_id, service, now_iso, counter)
+        if alert:
+            alerts.append(alert)
+            sort_keys.append(_priority_key(sev(alert['severity'], 0), alert.get('monthly_cost', 0)))
+    
+    return alerts, sort_keys
@@ -3,6 +3,7 @@
 import os
 import yaml
 import boto3
+import botocore.session
 import fnmatch
 from pathlib import Path
 from typing import Dict, Any, Optional, List
@@ -270,8 +271,21 @@ class ConfigManager:
             profiles.extend(self.raw_config['profiles'].keys())
         return profiles
     
-    def get_aws_session(self) -> boto3.Session:
-        """Create AWS session with AssumeRole/MFA if configured"""
+    @staticmethod
+    def _new_session(client_config=None, **kwargs) -> boto3.Session:
+        """Create a boto3 Session, applying client_config as the default client config"""
+        if client_config is None:
+            return boto3.Session(**kwargs)
+        
+        core_session = botocore.session.get_session()
+        core_session.set_default_client_config(client_config)
+        return boto3.Session(botocore_session=core_session, **kwargs)
+    
+    def get_aws_session(self, client_config=None) -> boto3.Session:
+        """
+        Create AWS session with AssumeRole/MFA if configured.
+        client_config (botocore Config) becomes the default for every client built from the session.
+        """
         role_arn = self.get('role_arn')
         aws_profile = self.get('aws_profile')
         mfa_serial = self.get('mfa_serial')
@@ -299,7 +313,8 @@ class ConfigManager:
             try:
                 response = sts.assume_role(**assume_role_params)
                 
-                return boto3.Session(
+                return self._new_session(
+                    client_config,
                     aws_access_key_id=response['Credentials']['AccessKeyId'],
                     aws_secret_access_key=response['Credentials']['SecretAccessKey'],
                     aws_session_token=response['Credentials']['SessionToken']
@@ -317,7 +332,7 @@ class ConfigManager:
         elif aws_profile:
             # Use AWS CLI profile
             try:
-                return boto3.Session(profile_name=aws_profile)
+                return self._new_session(client_config, profile_name=aws_profile)
             except Exception as e:
                 config_file = self._find_config_file() or 'No config file'
                 print(f"\nError: Failed to use AWS profile")
@@ -330,4 +345,4 @@ class ConfigManager:
         
         else:
             # Use default credentials (env vars, instance role, default profile)
-            return boto3.Session()
+            return self._new_session(client_config)
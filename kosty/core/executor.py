@@ -1,12 +1,46 @@
 import asyncio
 import boto3
 import json
+import threading
+import weakref
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from .progress import ProgressBar, SpinnerProgress
 from .storage import StorageManager
 
+# session -> lock serializing client creation on it, shared by every wrapper of that session
+_session_locks = weakref.WeakKeyDictionary()
+_session_locks_guard = threading.Lock()
+
+
+class _SerializedClientSession:
+    """
+    Wraps a boto3 Session shared by region threads. Clients are thread-safe, but
+    creating them from one Session is not, so client()/resource() calls are
+    serialized on a lock per underlying session; everything else is delegated.
+    """
+    
+    def __init__(self, session):
+        self._session = session
+        with _session_locks_guard:
+            lock = _session_locks.get(session)
+            if lock is None:
+                lock = _session_locks[session] = threading.Lock()
+        self._lock = lock
+    
+    def client(self, *args, **kwargs):
+        with self._lock:
+            return self._session.client(*args, **kwargs)
+    
+    def resource(self, *args, **kwargs):
+        with self._lock:
+            return self._session.resource(*args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
 class ServiceExecutor:
     def __init__(self, service, organization: bool, regions: List[str], max_workers: int = 5, cross_account_role: str = 'OrganizationAccountAccessRole', org_admin_account_id: str = None, config_manager=None, session=None):
         self.service = service
@@ -269,7 +303,12 @@ class ServiceExecutor:
                 print(f"\n📊 CSV report saved: {filename}")
     
     async def _execute_single_account(self, method_name: str, *args, **kwargs) -> Dict[str, Any]:
-        account_id = self.session.client('sts').get_caller_identity()['Account']
+        # Blocking STS call runs off the event loop so concurrent scans sharing the loop are not stalled
+        loop = asyncio.get_event_loop()
+        account_id = await loop.run_in_executor(
+            None,
+            lambda: self.session.client('sts').get_caller_identity()['Account']
+        )
         
         all_results = []
         
@@ -285,24 +324,38 @@ class ServiceExecutor:
         
         workers_per_region = max(1, self.max_workers // len(filtered_regions)) if filtered_regions else 1
         
-        for region in filtered_regions:
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                method = getattr(self.service, method_name)
-                try:
-                    result = await loop.run_in_executor(
-                        executor, 
-                        lambda r=region: method(self.session, r, max_workers=workers_per_region, config_manager=self.config_manager, *args, **kwargs)
-                    )
-                except TypeError:
-                    result = await loop.run_in_executor(
-                        executor, 
-                        lambda r=region: method(self.session, r, config_manager=self.config_manager, *args, **kwargs)
-                    )
-                all_results.extend(result)
+        for result in await self._run_regions(self.session, filtered_regions, method_name, workers_per_region, *args, **kwargs):
+            all_results.extend(result)
         
         return {account_id: all_results}
     
+    async def _run_regions(self, session, regions: List[str], method_name: str, workers_per_region: int, *args, **kwargs) -> List[Any]:
+        """Run the service method for all regions concurrently, returning results in region order"""
+        if not regions:
+            return []
+        
+        method = getattr(self.service, method_name)
+        loop = asyncio.get_event_loop()
+        
+        # Resolve credentials once up front, and serialize client creation: boto3
+        # sessions are not safe to initialize or build clients from several threads.
+        # Resolving may block (IMDS, SSO, AssumeRole), so it runs off the shared loop.
+        await loop.run_in_executor(None, session.get_credentials)
+        if len(regions) > 1:
+            session = _SerializedClientSession(session)
+        
+        def run(region):
+            try:
+                return method(session, region, max_workers=workers_per_region, config_manager=self.config_manager, *args, **kwargs)
+            except TypeError:
+                return method(session, region, config_manager=self.config_manager, *args, **kwargs)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(len(regions), self.max_workers))) as executor:
+            return await asyncio.gather(*[
+                loop.run_in_executor(executor, run, region)
+                for region in regions
+            ])
+    
     async def _execute_organization(self, method_name: str, *args, **kwargs) -> Dict[str, Any]:
         accounts = await self._get_organization_accounts()
         print(f"\n🏢 Found {len(accounts)} accounts in organization")
@@ -401,20 +454,8 @@ class ServiceExecutor:
             all_results = []
             workers_per_region = max(1, self.max_workers // len(self.regions))
             
-            for region in self.regions:
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    method = getattr(self.service, method_name)
-                    try:
-                        result = await loop.run_in_executor(
-                            executor,
-                            lambda r=region: method(assumed_session, r, max_workers=workers_per_region, config_manager=self.config_manager, *args, **kwargs)
-                        )
-                    except TypeError:
-                        result = await loop.run_in_executor(
-                            executor,
-                            lambda r=region: method(assumed_session, r, config_manager=self.config_manager, *args, **kwargs)
-                        )
-                    all_results.extend(result)
+            for result in await self._run_regions(assumed_session, self.regions, method_name, workers_per_region, *args, **kwargs):
+                all_results.extend(result)
             
             return all_results
             
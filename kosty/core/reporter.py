@@ -38,6 +38,17 @@ class CostOptimizationReporter:
             'monthly_savings': round(monthly_savings, 2) if monthly_savings > 0 else 0
         }
     
+    def get_totals(self):
+        """Return (total_issues, total_monthly_savings) across all accounts, in a single pass"""
+        total_issues = 0
+        total_savings = 0
+        for acc in self.results.values():
+            for svc in acc.values():
+                for cmd in svc.values():
+                    total_issues += cmd['count']
+                    total_savings += cmd.get('monthly_savings', 0)
+        return total_issues, total_savings
+    
 
     
     def generate_summary_report(self) -> str:
@@ -48,8 +59,7 @@ class CostOptimizationReporter:
         report.append("=" * 80)
         report.append(f"Scan Date: {self.scan_timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
         
-        total_issues = sum(sum(cmd['count'] for cmd in svc.values()) for acc in self.results.values() for svc in acc.values())
-        total_savings = sum(sum(cmd.get('monthly_savings', 0) for cmd in svc.values()) for acc in self.results.values() for svc in acc.values())
+        total_issues, total_savings = self.get_totals()
         
         report.append(f"Total Issues: {total_issues}")
         if total_savings > 0:
@@ -146,17 +156,14 @@ class CostOptimizationReporter:
                                 item['AccountId'] = account_id
                             standardized_results[account_id].append(item)
         
+        total_issues = self.get_totals()[0]
         report_data = {
             'scan_timestamp': self.scan_timestamp.isoformat(),
-            'total_issues': sum(sum(cmd['count'] for cmd in svc.values()) for acc in self.results.values() for svc in acc.values()),
+            'total_issues': total_issues,
             'results': standardized_results,
             'summary': {
                 'total_accounts': len(self.results),
-                'total_issues': sum(
-                    sum(cmd['count'] for cmd in svc.values())
-                    for acc in self.results.values()
-                    for svc in acc.values()
-                )
+                'total_issues': total_issues
             }
         }
         
@@ -67,24 +67,23 @@ class ComprehensiveScanner:
         
         try:
             import boto3
-            from concurrent.futures import ThreadPoolExecutor
             
             # Use profile session if available
             validation_session = self.session if self.session else boto3.Session()
+            loop = asyncio.get_event_loop()
             
             # If org admin account is specified, assume role there first
+            # (blocking calls go to the loop's default executor instead of a new pool each time)
             if self.org_admin_account_id:
                 sts_client = validation_session.client('sts')
-                loop = asyncio.get_event_loop()
                 
-                with ThreadPoolExecutor() as executor:
-                    assumed_role = await loop.run_in_executor(
-                        executor,
-                        lambda: sts_client.assume_role(
-                            RoleArn=f'arn:aws:iam::{self.org_admin_account_id}:role/{self.cross_account_role}',
-                            RoleSessionName='kosty-org-validation'
-                        )
+                assumed_role = await loop.run_in_executor(
+                    None,
+                    lambda: sts_client.assume_role(
+                        RoleArn=f'arn:aws:iam::{self.org_admin_account_id}:role/{self.cross_account_role}',
+                        RoleSessionName='kosty-org-validation'
                     )
+                )
                 
                 validation_session = boto3.Session(
                     aws_access_key_id=assumed_role['Credentials']['AccessKeyId'],
@@ -94,10 +93,7 @@ class ComprehensiveScanner:
             
             # Test Organizations access
             org_client = validation_session.client('organizations')
-            loop = asyncio.get_event_loop()
-            
-            with ThreadPoolExecutor() as executor:
-                await loop.run_in_executor(executor, org_client.list_accounts)
+            await loop.run_in_executor(None, org_client.list_accounts)
             
             return True
             
@@ -191,7 +187,7 @@ class ComprehensiveScanner:
         
         print("\n" + "=" * 60)
         print("✅ Comprehensive scan completed!")
-        total_issues = sum(sum(cmd['count'] for cmd in svc.values()) for acc in self.reporter.results.values() for svc in acc.values())
+        total_issues = self.reporter.get_totals()[0]
         print(f"📊 Total issues found: {total_issues}")
         print(f"💰 Ready to generate cost optimization reports")
         print("=" * 60)
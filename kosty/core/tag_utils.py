@@ -2,6 +2,26 @@
 
 from typing import List, Dict, Any, Optional
 
+# Field holding the tags in describe-call responses, per resource type
+_TAG_KEY_BY_TYPE = {
+    'ec2': 'Tags',
+    'ebs': 'Tags',
+    'snapshot': 'Tags',
+    'eip': 'Tags',
+    'nat': 'Tags',
+    'sg': 'Tags',
+    'vpc': 'Tags',
+    'rds': 'TagList',
+    'eks': 'tags',
+    'ecs': 'tags',
+}
+
+# Stand-in for an absent tag; never a member of a set of wanted values
+_MISSING = object()
+
+# Common environment tag keys
+_ENV_TAG_KEYS = frozenset({'Environment', 'Env', 'Stage', 'Tier', 'environment', 'env', 'stage'})
+
 
 def should_exclude_resource_by_tags(resource: Dict[str, Any], config_manager) -> bool:
     """Check if resource should be excluded based on tags
@@ -34,7 +54,12 @@ def get_resource_tags(resource: Dict[str, Any], resource_type: str = None) -> Li
     Returns:
         List of tag dictionaries with 'Key' and 'Value' fields
     """
-    tags = resource.get('Tags') or resource.get('tags') or resource.get('TagList') or []
+    tag_field = _TAG_KEY_BY_TYPE.get(resource_type)
+    if tag_field:
+        # Known resource type: read its tag field directly
+        tags = resource.get(tag_field) or []
+    else:
+        tags = resource.get('Tags') or resource.get('tags') or resource.get('TagList') or []
     
     # Some services return tags as a list of dicts with different key names
     if tags and isinstance(tags, list) and len(tags) > 0:
@@ -48,11 +73,35 @@ def get_resource_tags(resource: Dict[str, Any], resource_type: str = None) -> Li
                     normalized_tags.append({'Key': tag['key'], 'Value': tag['value']})
                 elif 'Name' in tag and 'Value' in tag:
                     normalized_tags.append({'Key': tag['Name'], 'Value': tag['Value']})
-        return normalized_tags if normalized_tags else tags
+        tags = normalized_tags if normalized_tags else tags
     
     return tags
 
 
+def get_resource_tag_map(resource: Dict[str, Any], resource_type: str = None) -> Dict[str, str]:
+    """Get a resource's tags as a {Key: Value} dict
+    
+    Args:
+        resource: Resource dict
+        resource_type: Optional resource type
+    
+    Returns:
+        Dict mapping tag keys to values (first occurrence wins)
+    """
+    tags = get_resource_tags(resource, resource_type)
+    
+    if isinstance(tags, dict):
+        tag_map = dict(tags)
+    else:
+        tag_map = {
+            tag['Key']: tag.get('Value')
+            for tag in reversed(tags)
+            if isinstance(tag, dict) and 'Key' in tag
+        }
+    
+    return tag_map
+
+
 def filter_resources_by_tag(resources: List[Dict[str, Any]], 
                             tag_key: str, 
                             tag_values: List[str] = None,
@@ -68,23 +117,13 @@ def filter_resources_by_tag(resources: List[Dict[str, Any]],
     Returns:
         Filtered list of resources matching the tag criteria
     """
-    filtered = []
-    
-    for resource in resources:
-        tags = get_resource_tags(resource, resource_type)
-        
-        for tag in tags:
-            if tag.get('Key') == tag_key:
-                if tag_values is None:
-                    # If no specific values provided, include any resource with this tag key
-                    filtered.append(resource)
-                    break
-                elif tag.get('Value') in tag_values:
-                    # Include resource if tag value matches
-                    filtered.append(resource)
-                    break
+    if tag_values is None:
+        # If no specific values provided, include any resource with this tag key
+        return [r for r in resources if tag_key in get_resource_tag_map(r, resource_type)]
     
-    return filtered
+    # Include resource if tag value matches (set membership, built once)
+    values = frozenset(tag_values)
+    return [r for r in resources if get_resource_tag_map(r, resource_type).get(tag_key, _MISSING) in values]
 
 
 def get_tag_value(resource: Dict[str, Any], tag_key: str, resource_type: str = None) -> Optional[str]:
@@ -98,13 +137,7 @@ def get_tag_value(resource: Dict[str, Any], tag_key: str, resource_type: str = N
     Returns:
         Tag value if found, None otherwise
     """
-    tags = get_resource_tags(resource, resource_type)
-    
-    for tag in tags:
-        if tag.get('Key') == tag_key:
-            return tag.get('Value')
-    
-    return None
+    return get_resource_tag_map(resource, resource_type).get(tag_key)
 
 
 def has_environment_tag(resource: Dict[str, Any], 
@@ -126,16 +159,14 @@ def has_environment_tag(resource: Dict[str, Any],
     if environments is None:
         environments = ['prod', 'production', 'staging', 'stage', 'dev', 'development', 'test']
     
-    # Common environment tag keys
-    env_keys = ['Environment', 'Env', 'Stage', 'Tier', 'environment', 'env', 'stage']
+    # Lowercase the wanted values once instead of per tag
+    envs_lc = {e.lower() for e in environments}
     
-    tags = get_resource_tags(resource, resource_type)
+    tag_map = get_resource_tag_map(resource, resource_type)
     
-    for tag in tags:
-        tag_key = tag.get('Key', '')
-        tag_value = tag.get('Value', '').lower()
-        
-        if tag_key in env_keys and tag_value in [e.lower() for e in environments]:
+    for key in _ENV_TAG_KEYS:
+        value = tag_map.get(key)
+        if value and value.lower() in envs_lc:
             return True
     
     return False
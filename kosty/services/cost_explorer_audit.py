@@ -1,7 +1,22 @@
 import boto3
+import copy
+from botocore.config import Config
+from botocore.exceptions import ClientError
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
-import json
+
+# Cost Explorer caps GetCostAndUsage at a shared 100 TPS and answers bursts with
+# LimitExceededException; adaptive retries back off and throttle client-side.
+# Merged over any default client config the session already carries.
+CE_CLIENT_CONFIG = Config(
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    connect_timeout=5,
+    read_timeout=30
+)
 
 class CostExplorerAuditService:
     """
@@ -15,8 +30,19 @@ class CostExplorerAuditService:
     TREND_INCREASE_THRESHOLD = 10.0  # Percentage increase to classify as "increasing"
     TREND_DECREASE_THRESHOLD = -10.0  # Percentage decrease to classify as "decreasing"
     
+    # Cost Explorer bills every request ($0.01), so responses are reused for a while
+    CE_CACHE_TTL = {'DAILY': 3600, 'MONTHLY': 86400}  # seconds, by requested period
+    ANOMALY_CACHE_TTL = 3600
+    CE_CACHE_MAX_ENTRIES = 512
+    
+    # AWS error codes meaning the account can't use the API (vs. a transient failure)
+    ACCESS_DENIED_CODES = frozenset(['AccessDenied', 'AccessDeniedException'])
+    CE_UNAVAILABLE_CODES = ACCESS_DENIED_CODES | {'OptInRequired'}
+    ANOMALY_UNAVAILABLE_CODES = ACCESS_DENIED_CODES | {'SubscriptionRequiredException'}
+    COST_HISTORY_DAYS = 90  # Daily history fetched once and shared by all periods
+    
     # Target AWS services to monitor
-    TARGET_SERVICES = [
+    TARGET_SERVICES = frozenset([
         'Amazon Elastic Compute Cloud - Compute',
         'Amazon Simple Storage Service',
         'AWS Lambda',
@@ -24,7 +50,7 @@ class CostExplorerAuditService:
         'Amazon CloudFront',
         'Amazon API Gateway',
         'Amazon DynamoDB'
-    ]
+    ])
     
     # Mock cost data for testing (monthly costs)
     MOCK_SERVICE_COSTS = {
@@ -37,47 +63,170 @@ class CostExplorerAuditService:
         'Amazon DynamoDB': {'daily': 1.80, 'weekly': 12.60, 'monthly': 54.00}
     }
     
+    # Fields shared by every finding this service emits
+    _FINDING_BASE = {
+        'Service': 'CostExplorer',
+        'service': 'CostExplorer',
+        'Region': 'global',
+        'region': 'global'
+    }
+    
     def __init__(self):
         self.cost_checks = ['analyze_costs_by_service', 'detect_cost_anomalies', 'check_budget_thresholds']
         self.security_checks = []
+        # Check methods resolved once, as (name, bound method) pairs
+        self._cost_check_fns = tuple((check, getattr(self, check)) for check in self.cost_checks)
+        # (period, include_points) -> (date built, mock findings without AccountId)
+        self._mock_results = {}
+        # session -> {service_name: client}; entries go away with their session
+        self._clients = weakref.WeakKeyDictionary()
+        self._clients_lock = threading.Lock()
+        # (account_id, api, *params) -> (response, stored_at)
+        self._ce_cache = {}
+        self._ce_cache_lock = threading.Lock()
+    
+    def _cached_ce_call(self, key: tuple, ttl: float, fetch):
+        """
+        Return a cached Cost Explorer response for key, calling fetch() on a miss.
+        Keys are primitives only (account id, dates, granularity) so entries are
+        shared across sessions for the same account.
+        """
+        now = time.monotonic()
+        with self._ce_cache_lock:
+            entry = self._ce_cache.get(key)
+            if entry and now - entry[1] <= ttl:
+                return entry[0]
+        
+        response = fetch()
+        
+        with self._ce_cache_lock:
+            if len(self._ce_cache) >= self.CE_CACHE_MAX_ENTRIES:
+                # Drop expired entries first, then the oldest ones
+                max_ttl = max(self.CE_CACHE_TTL.values())
+                for k in [k for k, v in self._ce_cache.items() if now - v[1] > max_ttl]:
+                    del self._ce_cache[k]
+                while len(self._ce_cache) >= self.CE_CACHE_MAX_ENTRIES:
+                    del self._ce_cache[next(iter(self._ce_cache))]
+            self._ce_cache[key] = (response, time.monotonic())
+        
+        return response
     
     def audit(self, session: boto3.Session, region: str, config_manager=None, **kwargs) -> List[Dict[str, Any]]:
         """Run complete cost audit (cost checks only, no security for this service)"""
-        results = []
-        results.extend(self.cost_audit(session, region, config_manager=config_manager, **kwargs))
-        return results
+        # cost_audit already returns a fresh list; no need to copy it
+        return self.cost_audit(session, region, config_manager=config_manager, **kwargs)
     
     def cost_audit(self, session: boto3.Session, region: str, config_manager=None, **kwargs) -> List[Dict[str, Any]]:
         """Run all cost optimization checks"""
         results = []
         
-        for check in self.cost_checks:
-            check_method = getattr(self, check, None)
-            if check_method and callable(check_method):
+        # Full audits only need the totals and trend, not every data point
+        kwargs.setdefault('include_points', False)
+        
+        # Resolve the account once instead of one STS call per check; an STS
+        # failure is reported like a failed check instead of failing the scan
+        if not kwargs.get('account_id'):
+            try:
+                kwargs['account_id'] = self._get_account_id(session)
+            except Exception as e:
+                print(f"Error getting account ID for cost checks: {e}")
+                return results
+        
+        # Build the clients up front and share them: creating clients from one
+        # session isn't thread-safe, while the clients themselves are, and the
+        # checks then reuse one connection pool per endpoint
+        kwargs.setdefault('ce_client', self._client(session, 'ce'))
+        kwargs.setdefault('budgets_client', self._client(session, 'budgets'))
+        
+        # The checks are independent network calls, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(self._cost_check_fns) or 1) as executor:
+            futures = [
+                (check, executor.submit(check_method, session, region, config_manager=config_manager, **kwargs))
+                for check, check_method in self._cost_check_fns
+            ]
+            
+            # Collect in check order so the output stays stable
+            for check, future in futures:
                 try:
-                    check_results = check_method(session, region, config_manager=config_manager, **kwargs)
-                    results.extend(check_results)
+                    results.extend(future.result())
                 except Exception as e:
                     print(f"Error running {check}: {e}")
         
         return results
     
+    @classmethod
+    def _base_finding(cls, account_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a finding from the shared base fields plus the check-specific ones"""
+        finding = {'AccountId': account_id}
+        finding.update(cls._FINDING_BASE)
+        finding.update(fields)
+        return finding
+    
+    @staticmethod
+    def _collect_pages(operation, result_key: str, **params) -> Dict[str, Any]:
+        """
+        Call a NextPageToken-paginated Cost Explorer operation until all pages
+        are read and return {result_key: items from every page}.
+        """
+        items = []
+        while True:
+            page = operation(**params)
+            items.extend(page.get(result_key, []))
+            token = page.get('NextPageToken')
+            if not token:
+                break
+            params['NextPageToken'] = token
+        
+        return {result_key: items}
+    
+    def _client(self, session: boto3.Session, service_name: str):
+        """
+        Return this session's client for a global billing service (ce, budgets,
+        sts), creating it once per session instead of once per check.
+        """
+        with self._clients_lock:
+            clients = self._clients.get(session)
+            if clients is None:
+                clients = self._clients[session] = {}
+            client = clients.get(service_name)
+            if client is None:
+                if service_name == 'sts':
+                    client = session.client('sts')
+                else:
+                    client = session.client(service_name, region_name='us-east-1', config=CE_CLIENT_CONFIG)
+                clients[service_name] = client
+        
+        return client
+    
+    @staticmethod
+    def _error_code(e: Exception) -> str:
+        """AWS error code of a ClientError, '' for any other exception"""
+        if isinstance(e, ClientError):
+            return e.response.get('Error', {}).get('Code', '')
+        return ''
+    
+    def _get_account_id(self, session: boto3.Session) -> str:
+        """Look up the account the session belongs to"""
+        return self._client(session, 'sts').get_caller_identity()['Account']
+    
     def security_audit(self, session: boto3.Session, region: str, config_manager=None, **kwargs) -> List[Dict[str, Any]]:
         """No security checks for Cost Explorer"""
         return []
     
     def analyze_costs_by_service(self, session: boto3.Session, region: str, 
                                   period: str = 'MONTHLY', 
-                                  config_manager=None, **kwargs) -> List[Dict[str, Any]]:
+                                  config_manager=None, account_id: str = None,
+                                  ce_client=None, include_points: bool = True,
+                                  **kwargs) -> List[Dict[str, Any]]:
         """
         Analyze costs by AWS service for the specified period.
         
         Args:
             period: DAILY, WEEKLY, or MONTHLY
+            include_points: Include the per-period data_points series in Details
         """
-        ce = session.client('ce', region_name='us-east-1')  # Cost Explorer is global
-        sts = session.client('sts')
-        account_id = sts.get_caller_identity()['Account']
+        ce = ce_client or self._client(session, 'ce')  # Cost Explorer is global
+        account_id = account_id or self._get_account_id(session)
         results = []
         
         try:
@@ -86,99 +235,123 @@ class CostExplorerAuditService:
             
             if period == 'DAILY':
                 start_date = end_date - timedelta(days=7)
-                granularity = 'DAILY'
             elif period == 'WEEKLY':
                 start_date = end_date - timedelta(days=28)
-                granularity = 'DAILY'
             else:  # MONTHLY
                 start_date = end_date - timedelta(days=90)
-                granularity = 'MONTHLY'
-            
-            # Services to monitor specifically
-            target_services = self.TARGET_SERVICES
+            monthly = period not in ('DAILY', 'WEEKLY')
             
-            # Get cost and usage data
-            response = ce.get_cost_and_usage(
-                TimePeriod={
-                    'Start': start_date.strftime('%Y-%m-%d'),
-                    'End': end_date.strftime('%Y-%m-%d')
-                },
-                Granularity=granularity,
-                Metrics=['UnblendedCost', 'UsageQuantity'],
-                GroupBy=[{'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+            # One DAILY request over the longest window serves every period:
+            # shorter windows are sliced from it and MONTHLY is rolled up here,
+            # so DAILY/WEEKLY/MONTHLY views share a single (cached) paid call
+            fetch_start_str = (end_date - timedelta(days=self.COST_HISTORY_DAYS)).strftime('%Y-%m-%d')
+            start_str = start_date.strftime('%Y-%m-%d')
+            end_str = end_date.strftime('%Y-%m-%d')
+            # The entry is shared, but freshness is judged by the requested view:
+            # a MONTHLY rollup accepts data up to a day old, DAILY/WEEKLY an hour
+            response = self._cached_ce_call(
+                (account_id, 'get_cost_and_usage', fetch_start_str, end_str, 'DAILY'),
+                self.CE_CACHE_TTL['MONTHLY' if monthly else 'DAILY'],
+                lambda: self._collect_pages(
+                    ce.get_cost_and_usage, 'ResultsByTime',
+                    TimePeriod={
+                        'Start': fetch_start_str,
+                        'End': end_str
+                    },
+                    Granularity='DAILY',
+                    Metrics=['UnblendedCost', 'UsageQuantity'],
+                    GroupBy=[{'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+                )
             )
             
             # Process results
             service_costs = {}
             for result_by_time in response.get('ResultsByTime', []):
+                date = result_by_time['TimePeriod']['Start']
+                if date < start_str:
+                    continue
+                # Monthly points start on the 1st (or the window start for the first month)
+                point_date = max(start_str, date[:8] + '01') if monthly else date
+                
                 for group in result_by_time.get('Groups', []):
                     service = group['Keys'][0]
                     cost = float(group['Metrics']['UnblendedCost']['Amount'])
                     
-                    if service not in service_costs:
-                        service_costs[service] = {
+                    data = service_costs.get(service)
+                    if data is None:
+                        # Parallel date/cost columns; point dicts are only built if requested
+                        data = service_costs[service] = {
                             'total': 0,
-                            'data_points': []
+                            'dates': [],
+                            'costs': []
                         }
                     
-                    service_costs[service]['total'] += cost
-                    service_costs[service]['data_points'].append({
-                        'date': result_by_time['TimePeriod']['Start'],
-                        'cost': cost
-                    })
+                    data['total'] += cost
+                    dates = data['dates']
+                    costs = data['costs']
+                    if monthly and dates and dates[-1] == point_date:
+                        costs[-1] += cost
+                    else:
+                        dates.append(point_date)
+                        costs.append(cost)
             
             # Create findings for services with significant costs
             for service, data in service_costs.items():
                 if data['total'] > self.MIN_COST_THRESHOLD:  # Only report services costing > $1
                     # Calculate trend
-                    if len(data['data_points']) >= 2:
-                        recent_cost = sum(dp['cost'] for dp in data['data_points'][-3:]) / min(3, len(data['data_points'][-3:]))
-                        older_cost = sum(dp['cost'] for dp in data['data_points'][:3]) / min(3, len(data['data_points'][:3]))
+                    costs = data['costs']
+                    if len(costs) >= 2:
+                        # Average of the last and first (up to) three points
+                        tail = costs[-3:]
+                        head = costs[:3]
+                        recent_cost = sum(tail) / len(tail)
+                        older_cost = sum(head) / len(head)
                         trend_pct = ((recent_cost - older_cost) / older_cost * 100) if older_cost > 0 else 0
                         trend = 'increasing' if trend_pct > self.TREND_INCREASE_THRESHOLD else ('decreasing' if trend_pct < self.TREND_DECREASE_THRESHOLD else 'stable')
                     else:
                         trend = 'unknown'
                         trend_pct = 0
                     
-                    results.append({
-                        'AccountId': account_id,
-                        'Service': 'CostExplorer',
-                        'service': 'CostExplorer',
-                        'Region': 'global',
-                        'region': 'global',
+                    details = {
+                        'aws_service': service,
+                        'total_cost': round(data['total'], 2),
+                        'period': period,
+                        'trend': trend,
+                        'trend_percentage': round(trend_pct, 2)
+                    }
+                    if include_points:
+                        details['data_points'] = [
+                            {'date': date, 'cost': cost}
+                            for date, cost in zip(data['dates'], costs)
+                        ]
+                    
+                    results.append(self._base_finding(account_id, {
                         'Issue': f'{service} - {period.lower()} cost analysis',
-                        'Details': {
-                            'aws_service': service,
-                            'total_cost': round(data['total'], 2),
-                            'period': period,
-                            'trend': trend,
-                            'trend_percentage': round(trend_pct, 2),
-                            'data_points': data['data_points']
-                        },
+                        'Details': details,
                         'type': 'info',
                         'severity': 'info',
                         'check': 'cost_by_service',
                         'resource_id': service,
                         'resource_name': service,
                         'monthly_cost': round(data['total'], 2) if period == 'MONTHLY' else round(data['total'] * 30 / ((end_date - start_date).days), 2)
-                    })
+                    }))
         
         except Exception as e:
             # If Cost Explorer is not available, return mock data
-            if 'OptInRequired' in str(e) or 'AccessDenied' in str(e):
-                return self._get_mock_cost_data(account_id, period)
+            if self._error_code(e) in self.CE_UNAVAILABLE_CODES:
+                return self._get_mock_cost_data(account_id, period, include_points)
             print(f"Error analyzing costs by service: {e}")
         
         return results
     
     def detect_cost_anomalies(self, session: boto3.Session, region: str, 
-                             config_manager=None, **kwargs) -> List[Dict[str, Any]]:
+                             config_manager=None, account_id: str = None,
+                             ce_client=None, **kwargs) -> List[Dict[str, Any]]:
         """
         Detect cost anomalies using AWS Cost Anomaly Detection.
         """
-        ce = session.client('ce', region_name='us-east-1')
-        sts = session.client('sts')
-        account_id = sts.get_caller_identity()['Account']
+        ce = ce_client or self._client(session, 'ce')
+        account_id = account_id or self._get_account_id(session)
         results = []
         
         try:
@@ -188,12 +361,7 @@ class CostExplorerAuditService:
             
             if not monitors:
                 # Suggest enabling anomaly detection
-                results.append({
-                    'AccountId': account_id,
-                    'Service': 'CostExplorer',
-                    'service': 'CostExplorer',
-                    'Region': 'global',
-                    'region': 'global',
+                results.append(self._base_finding(account_id, {
                     'Issue': 'Cost Anomaly Detection not configured',
                     'Details': 'Enable Cost Anomaly Detection to automatically identify unusual spending patterns',
                     'type': 'recommendation',
@@ -202,61 +370,64 @@ class CostExplorerAuditService:
                     'resource_id': 'anomaly-detection',
                     'resource_name': 'Cost Anomaly Detection',
                     'Recommendation': 'Set up Cost Anomaly Detection monitors in AWS Cost Explorer console'
-                })
+                }))
                 return results
             
             # Get anomalies from the last 30 days
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=30)
             
-            anomalies_response = ce.get_anomalies(
-                DateInterval={
-                    'StartDate': start_date.strftime('%Y-%m-%d'),
-                    'EndDate': end_date.strftime('%Y-%m-%d')
-                },
-                Feedback='ALL'
+            start_str = start_date.strftime('%Y-%m-%d')
+            end_str = end_date.strftime('%Y-%m-%d')
+            anomalies_response = self._cached_ce_call(
+                (account_id, 'get_anomalies', start_str, end_str),
+                self.ANOMALY_CACHE_TTL,
+                lambda: self._collect_pages(
+                    ce.get_anomalies, 'Anomalies',
+                    DateInterval={
+                        'StartDate': start_str,
+                        'EndDate': end_str
+                    },
+                    Feedback='ALL'
+                )
             )
             
+            threshold = self.MIN_ANOMALY_IMPACT_THRESHOLD
             for anomaly in anomalies_response.get('Anomalies', []):
                 impact = anomaly.get('Impact', {})
-                max_impact = impact.get('MaxImpact', 0)
-                total_impact = impact.get('TotalImpact', 0)
+                total_impact = float(impact.get('TotalImpact', 0))
                 
-                # Only report significant anomalies (> $10 impact)
-                if float(total_impact) > self.MIN_ANOMALY_IMPACT_THRESHOLD:
-                    results.append({
-                        'AccountId': account_id,
-                        'Service': 'CostExplorer',
-                        'service': 'CostExplorer',
-                        'Region': 'global',
-                        'region': 'global',
-                        'Issue': 'Cost anomaly detected',
-                        'Details': {
-                            'anomaly_id': anomaly['AnomalyId'],
-                            'anomaly_score': anomaly.get('AnomalyScore', {}).get('MaxScore', 0),
-                            'impact': round(float(total_impact), 2),
-                            'max_impact': round(float(max_impact), 2),
-                            'dimension_value': anomaly.get('DimensionValue', 'Unknown'),
-                            'start_date': anomaly.get('AnomalyStartDate', ''),
-                            'end_date': anomaly.get('AnomalyEndDate', '')
-                        },
-                        'type': 'cost',
-                        'severity': 'high' if float(total_impact) > 100 else 'medium',
-                        'check': 'cost_anomaly',
-                        'resource_id': anomaly['AnomalyId'],
-                        'resource_name': f"Anomaly-{anomaly.get('DimensionValue', 'Unknown')}",
-                        'monthly_cost_impact': round(float(total_impact), 2)
-                    })
+                # Only report significant anomalies (> $10 impact); skip the rest
+                # before doing any other per-anomaly work
+                if total_impact <= threshold:
+                    continue
+                
+                impact_rounded = round(total_impact, 2)
+                anomaly_id = anomaly['AnomalyId']
+                dimension_value = anomaly.get('DimensionValue', 'Unknown')
+                results.append(self._base_finding(account_id, {
+                    'Issue': 'Cost anomaly detected',
+                    'Details': {
+                        'anomaly_id': anomaly_id,
+                        'anomaly_score': anomaly.get('AnomalyScore', {}).get('MaxScore', 0),
+                        'impact': impact_rounded,
+                        'max_impact': round(float(impact.get('MaxImpact', 0)), 2),
+                        'dimension_value': dimension_value,
+                        'start_date': anomaly.get('AnomalyStartDate', ''),
+                        'end_date': anomaly.get('AnomalyEndDate', '')
+                    },
+                    'type': 'cost',
+                    'severity': 'high' if total_impact > 100 else 'medium',
+                    'check': 'cost_anomaly',
+                    'resource_id': anomaly_id,
+                    'resource_name': f"Anomaly-{dimension_value}",
+                    'monthly_cost_impact': impact_rounded
+                }))
         
         except Exception as e:
             # If anomaly detection is not enabled, return recommendation
-            if 'AccessDenied' in str(e) or 'not subscribed' in str(e):
-                results.append({
-                    'AccountId': account_id,
-                    'Service': 'CostExplorer',
-                    'service': 'CostExplorer',
-                    'Region': 'global',
-                    'region': 'global',
+            if self._error_code(e) in self.ANOMALY_UNAVAILABLE_CODES or 'not subscribed' in str(e):
+                results.append(self._base_finding(account_id, {
                     'Issue': 'Cost Anomaly Detection not enabled',
                     'Details': 'Enable Cost Anomaly Detection to monitor for unusual spending',
                     'type': 'recommendation',
@@ -265,34 +436,32 @@ class CostExplorerAuditService:
                     'resource_id': 'anomaly-detection',
                     'resource_name': 'Cost Anomaly Detection',
                     'Recommendation': 'Enable Cost Anomaly Detection in AWS Cost Explorer'
-                })
+                }))
             else:
                 print(f"Error detecting cost anomalies: {e}")
         
         return results
     
     def check_budget_thresholds(self, session: boto3.Session, region: str, 
-                                config_manager=None, **kwargs) -> List[Dict[str, Any]]:
+                                config_manager=None, account_id: str = None,
+                                budgets_client=None, **kwargs) -> List[Dict[str, Any]]:
         """
         Check AWS Budgets and identify budgets that have exceeded or are approaching thresholds.
         """
-        budgets = session.client('budgets', region_name='us-east-1')  # Budgets is global
-        sts = session.client('sts')
-        account_id = sts.get_caller_identity()['Account']
+        budgets = budgets_client or self._client(session, 'budgets')  # Budgets is global
+        account_id = account_id or self._get_account_id(session)
         results = []
         
         try:
             # List all budgets
-            budgets_response = budgets.describe_budgets(AccountId=account_id)
+            budget_list = []
+            paginator = budgets.get_paginator('describe_budgets')
+            for page in paginator.paginate(AccountId=account_id):
+                budget_list.extend(page.get('Budgets', []))
             
-            if not budgets_response.get('Budgets'):
+            if not budget_list:
                 # Recommend setting up budgets
-                results.append({
-                    'AccountId': account_id,
-                    'Service': 'CostExplorer',
-                    'service': 'CostExplorer',
-                    'Region': 'global',
-                    'region': 'global',
+                results.append(self._base_finding(account_id, {
                     'Issue': 'No AWS Budgets configured',
                     'Details': 'Set up AWS Budgets to receive alerts when costs exceed thresholds',
                     'type': 'recommendation',
@@ -301,10 +470,10 @@ class CostExplorerAuditService:
                     'resource_id': 'budgets',
                     'resource_name': 'AWS Budgets',
                     'Recommendation': 'Configure AWS Budgets with appropriate thresholds and alerts'
-                })
+                }))
                 return results
             
-            for budget in budgets_response.get('Budgets', []):
+            for budget in budget_list:
                 budget_name = budget['BudgetName']
                 budget_limit = float(budget['BudgetLimit']['Amount'])
                 
@@ -321,12 +490,7 @@ class CostExplorerAuditService:
                 if usage_pct > 80 or forecast_pct > 100:
                     severity = 'critical' if usage_pct > 100 else 'high' if usage_pct > 90 else 'medium'
                     
-                    results.append({
-                        'AccountId': account_id,
-                        'Service': 'CostExplorer',
-                        'service': 'CostExplorer',
-                        'Region': 'global',
-                        'region': 'global',
+                    results.append(self._base_finding(account_id, {
                         'Issue': f'Budget threshold alert: {budget_name}',
                         'Details': {
                             'budget_name': budget_name,
@@ -343,17 +507,12 @@ class CostExplorerAuditService:
                         'resource_id': budget_name,
                         'resource_name': budget_name,
                         'Recommendation': f'Review spending for {budget_name}. Current: ${actual_spend:.2f} / ${budget_limit:.2f} ({usage_pct:.1f}%)'
-                    })
+                    }))
         
         except Exception as e:
             # If budgets are not configured, return recommendation
-            if 'AccessDenied' in str(e):
-                results.append({
-                    'AccountId': account_id,
-                    'Service': 'CostExplorer',
-                    'service': 'CostExplorer',
-                    'Region': 'global',
-                    'region': 'global',
+            if self._error_code(e) in self.ACCESS_DENIED_CODES:
+                results.append(self._base_finding(account_id, {
                     'Issue': 'Cannot access AWS Budgets',
                     'Details': 'Ensure you have permissions to access AWS Budgets API',
                     'type': 'recommendation',
@@ -361,40 +520,63 @@ class CostExplorerAuditService:
                     'check': 'budget_access',
                     'resource_id': 'budgets',
                     'resource_name': 'AWS Budgets'
-                })
+                }))
             else:
                 print(f"Error checking budget thresholds: {e}")
         
         return results
     
-    def _get_mock_cost_data(self, account_id: str, period: str) -> List[Dict[str, Any]]:
+    def _get_mock_cost_data(self, account_id: str, period: str,
+                            include_points: bool = True) -> List[Dict[str, Any]]:
         """
         Generate mock cost data for testing when Cost Explorer is not available.
         This provides realistic sample data matching production API response format.
         """
+        # The mock findings only depend on the period and the current date, so
+        # they are built once per day; each call gets its own deep copy (callers
+        # may modify the nested Details) stamped with the account id
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        key = (period, include_points)
+        cached = self._mock_results.get(key)
+        if cached is None or cached[0] != today:
+            cached = self._mock_results[key] = (today, self._build_mock_cost_data(period, include_points, now))
+        
+        return [{**copy.deepcopy(template), 'AccountId': account_id} for template in cached[1]]
+    
+    def _build_mock_cost_data(self, period: str, include_points: bool, now: datetime) -> List[Dict[str, Any]]:
+        """Build the mock cost findings for a period, without an account id"""
         results = []
+        account_id = None
         
-        # Use mock services data from class constant
-        mock_services = self.MOCK_SERVICE_COSTS
+        # Data point dates are the same for every service: format them once
+        if period == 'DAILY':
+            offsets = range(7)
+        elif period == 'WEEKLY':
+            offsets = range(0, 28, 7)
+        else:  # MONTHLY
+            offsets = [i * 30 for i in range(3)]
+        date_strs = [(now - timedelta(days=d)).strftime('%Y-%m-%d') for d in offsets]
         
-        for service, costs in mock_services.items():
+        # Use mock services data from class constant
+        for service, costs in self.MOCK_SERVICE_COSTS.items():
             cost_key = period.lower() if period.lower() in costs else 'monthly'
             total_cost = costs[cost_key]
             
             # Generate mock data points
             if period == 'DAILY':
                 days = 7
-                data_points = [{'date': (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d'), 
+                data_points = [{'date': date_strs[i], 
                                'cost': round(total_cost / days + (i % 3 - 1) * 0.5, 2)} 
                               for i in range(days)]
             elif period == 'WEEKLY':
                 days = 28
-                data_points = [{'date': (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d'), 
+                data_points = [{'date': date_str, 
                                'cost': round(total_cost / days + (i % 5 - 2) * 0.3, 2)} 
-                              for i in range(0, days, 7)]
+                              for i, date_str in zip(range(0, days, 7), date_strs)]
             else:  # MONTHLY
                 months = 3
-                data_points = [{'date': (datetime.now() - timedelta(days=i*30)).strftime('%Y-%m-%d'), 
+                data_points = [{'date': date_strs[i], 
                                'cost': round(total_cost + (i % 3 - 1) * 20, 2)} 
                               for i in range(months)]
             
@@ -408,28 +590,26 @@ class CostExplorerAuditService:
                 trend = 'stable'
                 trend_pct = 0
             
-            results.append({
-                'AccountId': account_id,
-                'Service': 'CostExplorer',
-                'service': 'CostExplorer',
-                'Region': 'global',
-                'region': 'global',
+            details = {
+                'aws_service': service,
+                'total_cost': round(total_cost, 2),
+                'period': period,
+                'trend': trend,
+                'trend_percentage': round(trend_pct, 2),
+                'note': 'This is mock data for testing purposes'
+            }
+            if include_points:
+                details['data_points'] = data_points
+            
+            results.append(self._base_finding(account_id, {
                 'Issue': f'{service} - {period.lower()} cost analysis (MOCK DATA)',
-                'Details': {
-                    'aws_service': service,
-                    'total_cost': round(total_cost, 2),
-                    'period': period,
-                    'trend': trend,
-                    'trend_percentage': round(trend_pct, 2),
-                    'data_points': data_points,
-                    'note': 'This is mock data for testing purposes'
-                },
+                'Details': details,
                 'type': 'info',
                 'severity': 'info',
                 'check': 'cost_by_service',
                 'resource_id': f'mock-{service}',
                 'resource_name': service,
                 'monthly_cost': round(costs['monthly'], 2)
-            })
+            }))
         
         return results
@@ -1,6 +1,35 @@
 import boto3
+import bisect
+import re
+import threading
+import time
+import weakref
+from botocore.config import Config
+from botocore.exceptions import ClientError, EndpointConnectionError
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
-from datetime import datetime, timedelta
+
+# Adaptive retries throttle client-side instead of retrying into GuardDuty's
+# rate limits, and the pool is sized above max_workers so concurrent detector
+# and findings calls don't queue for a connection. Merged over any default
+# client config the session already carries.
+GUARDDUTY_CLIENT_CONFIG = Config(
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    max_pool_connections=32,
+    tcp_keepalive=True
+)
+
+
+def _compile_action_patterns(actions: Dict[str, str]):
+    """
+    Compile 'Category:Resource' action patterns into one anchored alternation,
+    one named group per pattern, plus the group name -> action lookup.
+    Alternatives are tried in dict order, like the original startswith scan.
+    """
+    groups = {f'p{i}': (pattern, action) for i, (pattern, action) in enumerate(actions.items())}
+    regex = re.compile('|'.join(f'(?P<{name}>{re.escape(pattern)})' for name, (pattern, _) in groups.items()))
+    return regex, {name: action for name, (_, action) in groups.items()}
+
 
 class GuardDutyAuditService:
     """
@@ -12,6 +41,18 @@ class GuardDutyAuditService:
     HIGH_SEVERITY_THRESHOLD = 7.0  # Severity score threshold for high/critical findings
     CRITICAL_SEVERITY_THRESHOLD = 9.0
     MEDIUM_SEVERITY_THRESHOLD = 4.0
+    # Ascending thresholds; bisect_right(...) indexes the matching label
+    _SEVERITY_THRESHOLDS = (MEDIUM_SEVERITY_THRESHOLD, HIGH_SEVERITY_THRESHOLD, CRITICAL_SEVERITY_THRESHOLD)
+    _SEVERITY_LABELS = ('low', 'medium', 'high', 'critical')
+    ACCESS_DENIED_CODES = frozenset(['AccessDenied', 'AccessDeniedException', 'UnauthorizedOperation'])
+    DETECTOR_MISSING_CODES = frozenset(['BadRequestException', 'NotFoundException'])
+    # Returned for regions the account hasn't opted into
+    REGION_UNAVAILABLE_CODES = frozenset(['UnrecognizedClientException'])
+    DISABLED_REGION_TTL = 3600  # Seconds a region found not enabled is skipped before retrying
+    FINDINGS_BATCH_SIZE = 50  # Max ids per list_findings page / get_findings call
+    # Parts of a finding's Resource kept in resource_details unless full_details is set
+    # (the EC2, IAM and S3 resources the recommendations cover)
+    RESOURCE_DETAIL_KEYS = ('ResourceType', 'InstanceDetails', 'AccessKeyDetails', 'S3BucketDetails')
     
     # GuardDuty finding type to action-oriented recommendation mappings
     FINDING_TYPE_ACTIONS = {
@@ -31,10 +72,84 @@ class GuardDutyAuditService:
         'Exfiltration:S3': 'Data may be exfiltrated from S3. Review bucket policies, enable S3 access logging, and investigate suspicious downloads.',
         'Impact:EC2': 'EC2 instance involved in denial of service or other impacts. Isolate instance and investigate traffic patterns.',
     }
+    # Single regex matching any pattern as a prefix; the matched group names the action
+    _FINDING_TYPE_RE, _ACTION_BY_GROUP = _compile_action_patterns(FINDING_TYPE_ACTIONS)
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 8):
         self.cost_checks = []
         self.security_checks = ['check_guardduty_status', 'get_high_severity_findings']
+        self.max_workers = max_workers  # Concurrent per-detector API calls
+        # session -> account id; caller identity is fixed for a session's credentials
+        self._account_ids = weakref.WeakKeyDictionary()
+        self._account_ids_lock = threading.Lock()
+        # session -> {(service_name, region): client}
+        self._clients = weakref.WeakKeyDictionary()
+        self._clients_lock = threading.Lock()
+        # Regions with a GuardDuty endpoint (from botocore's bundled endpoint data),
+        # and (account_id, region) pairs found unusable, e.g. opt-in regions not enabled
+        self._guardduty_regions = None
+        self._disabled_regions = {}  # (account_id, region) -> time.monotonic() when found disabled
+    
+    def _client(self, session: boto3.Session, service_name: str, region: str = None):
+        """
+        Return this session's client for a service and region, creating it once
+        instead of once per check. Creation is serialized, as session.client()
+        isn't thread-safe; the clients themselves are shared freely.
+        """
+        key = (service_name, region)
+        with self._clients_lock:
+            clients = self._clients.get(session)
+            if clients is None:
+                clients = self._clients[session] = {}
+            client = clients.get(key)
+            if client is None:
+                client = clients[key] = session.client(
+                    service_name, region_name=region, config=GUARDDUTY_CLIENT_CONFIG
+                )
+        
+        return client
+    
+    @staticmethod
+    def _error_code(e: Exception) -> str:
+        """AWS error code of a ClientError, '' for any other exception"""
+        if isinstance(e, ClientError):
+            return e.response.get('Error', {}).get('Code', '')
+        return ''
+    
+    def _region_known(self, session: boto3.Session, region: str) -> bool:
+        """Whether the installed botocore lists a GuardDuty endpoint in the region; no API call"""
+        if self._guardduty_regions is None:
+            # Read through the session like client creation, so under the same lock
+            with self._clients_lock:
+                regions = set()
+                for partition in session.get_available_partitions():
+                    regions.update(session.get_available_regions('guardduty', partition_name=partition))
+                self._guardduty_regions = frozenset(regions)
+        
+        # An empty list means the endpoint data doesn't know the service; don't filter then
+        return not self._guardduty_regions or region in self._guardduty_regions
+    
+    def _get_account_id(self, session: boto3.Session) -> str:
+        """Look up the account the session belongs to, once per session"""
+        with self._account_ids_lock:
+            account_id = self._account_ids.get(session)
+        if account_id is None:
+            account_id = self._client(session, 'sts').get_caller_identity()['Account']
+            with self._account_ids_lock:
+                self._account_ids[session] = account_id
+        return account_id
+    
+    def _map_concurrent(self, fn, items: list) -> list:
+        """
+        Call fn(item) for every item (detector id, findings batch), concurrently when
+        there are several. Results come back in item order; the GuardDuty client is
+        shared, as boto3 clients are thread-safe.
+        """
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        
+        with ThreadPoolExecutor(max_workers=min(len(items), self.max_workers)) as executor:
+            return list(executor.map(fn, items))
     
     def audit(self, session: boto3.Session, region: str, config_manager=None, **kwargs) -> List[Dict[str, Any]]:
         """Run complete security audit (security checks only, no cost for this service)"""
@@ -42,6 +157,36 @@ class GuardDutyAuditService:
         results.extend(self.security_audit(session, region, config_manager=config_manager, **kwargs))
         return results
     
+    def audit_regions(self, profile: str, regions: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Audit several regions in parallel, one thread per region, sharing one
+        boto3 session for the given profile (None for the default credentials).
+        Results are concatenated in region order.
+        """
+        try:
+            session = boto3.Session(profile_name=profile)
+            # Resolve the credentials once here instead of in every worker thread
+            session.get_credentials()
+        except Exception as e:
+            print(f"Error creating session for GuardDuty audit: {e}")
+            return []
+        
+        def audit_region(region):
+            try:
+                return self.audit(session, region, **kwargs)
+            except Exception as e:
+                print(f"Error auditing GuardDuty in {region}: {e}")
+                return []
+        
+        if len(regions) <= 1:
+            per_region = [audit_region(region) for region in regions]
+        else:
+            # The work is network I/O, so size the pool by regions, not CPUs
+            with ThreadPoolExecutor(max_workers=len(regions)) as executor:
+                per_region = list(executor.map(audit_region, regions))
+        
+        return [item for items in per_region for item in items]
+    
     def cost_audit(self, session: boto3.Session, region: str, config_manager=None, **kwargs) -> List[Dict[str, Any]]:
         """No cost checks for GuardDuty"""
         return []
@@ -50,6 +195,32 @@ class GuardDutyAuditService:
         """Run all security checks"""
         results = []
         
+        if not self._region_known(session, region):
+            # Possibly a region newer than the installed botocore: query it anyway,
+            # an unavailable region ends up in _disabled_regions below
+            print(f"GuardDuty endpoint for {region} is not in the installed botocore data, trying it anyway")
+        
+        # Look up the account and detectors once and share them with every check;
+        # on failure each check fetches (and reports) them itself.
+        # check_guardduty_status fills detector_statuses for the checks after it.
+        kwargs.setdefault('detector_statuses', {})
+        if 'account_id' not in kwargs or 'detectors' not in kwargs:
+            try:
+                kwargs.setdefault('account_id', self._get_account_id(session))
+                disabled_at = self._disabled_regions.get((kwargs['account_id'], region))
+                if disabled_at is not None and time.monotonic() - disabled_at <= self.DISABLED_REGION_TTL:
+                    return results
+                if 'detectors' not in kwargs:
+                    gd = self._client(session, 'guardduty', region)
+                    kwargs['detectors'] = gd.list_detectors().get('DetectorIds', [])
+            except Exception as e:
+                region_unavailable = (self._error_code(e) in self.REGION_UNAVAILABLE_CODES
+                                      or isinstance(e, EndpointConnectionError))
+                if region_unavailable and kwargs.get('account_id'):
+                    # Region not enabled for this account (or no endpoint); skip it for a while
+                    self._disabled_regions[(kwargs['account_id'], region)] = time.monotonic()
+                    return results
+        
         for check in self.security_checks:
             check_method = getattr(self, check, None)
             if check_method and callable(check_method):
@@ -62,28 +233,28 @@ class GuardDutyAuditService:
         return results
     
     def check_guardduty_status(self, session: boto3.Session, region: str, 
-                               config_manager=None, **kwargs) -> List[Dict[str, Any]]:
+                               config_manager=None, detectors: List[str] = None,
+                               account_id: str = None, detector_statuses: Dict[str, str] = None,
+                               **kwargs) -> List[Dict[str, Any]]:
         """
         Check if GuardDuty is enabled in the region and account.
+        Records each detector's status in detector_statuses when one is passed.
         """
-        gd = session.client('guardduty', region_name=region)
-        sts = session.client('sts')
-        account_id = sts.get_caller_identity()['Account']
+        gd = self._client(session, 'guardduty', region)
+        account_id = account_id or self._get_account_id(session)
+        base = {'AccountId': account_id, 'Service': 'GuardDuty', 'service': 'GuardDuty',
+                'Region': region, 'region': region}
         results = []
         
         try:
-            # List detectors
-            detectors_response = gd.list_detectors()
-            detectors = detectors_response.get('DetectorIds', [])
+            # List detectors, unless security_audit already did
+            if detectors is None:
+                detectors = gd.list_detectors().get('DetectorIds', [])
             
             if not detectors:
                 # GuardDuty not enabled - high priority recommendation
                 results.append({
-                    'AccountId': account_id,
-                    'Service': 'GuardDuty',
-                    'service': 'GuardDuty',
-                    'Region': region,
-                    'region': region,
+                    **base,
                     'Issue': 'GuardDuty not enabled',
                     'Details': 'GuardDuty provides intelligent threat detection for your AWS environment',
                     'type': 'security',
@@ -96,17 +267,17 @@ class GuardDutyAuditService:
                 })
             else:
                 # GuardDuty is enabled - check status
-                for detector_id in detectors:
-                    detector = gd.get_detector(DetectorId=detector_id)
+                detector_infos = self._map_concurrent(
+                    lambda detector_id: gd.get_detector(DetectorId=detector_id), detectors
+                )
+                for detector_id, detector in zip(detectors, detector_infos):
                     status = detector.get('Status', 'UNKNOWN')
+                    if detector_statuses is not None:
+                        detector_statuses[detector_id] = status
                     
                     if status != 'ENABLED':
                         results.append({
-                            'AccountId': account_id,
-                            'Service': 'GuardDuty',
-                            'service': 'GuardDuty',
-                            'Region': region,
-                            'region': region,
+                            **base,
                             'Issue': f'GuardDuty detector is {status}',
                             'Details': f'Detector {detector_id} is not actively monitoring',
                             'type': 'security',
@@ -119,11 +290,7 @@ class GuardDutyAuditService:
                     else:
                         # GuardDuty is active - informational
                         results.append({
-                            'AccountId': account_id,
-                            'Service': 'GuardDuty',
-                            'service': 'GuardDuty',
-                            'Region': region,
-                            'region': region,
+                            **base,
                             'Issue': 'GuardDuty is active',
                             'Details': {
                                 'detector_id': detector_id,
@@ -141,13 +308,9 @@ class GuardDutyAuditService:
         
         except Exception as e:
             # Handle permission errors or GuardDuty not available
-            if 'AccessDenied' in str(e) or 'UnauthorizedOperation' in str(e):
+            if self._error_code(e) in self.ACCESS_DENIED_CODES:
                 results.append({
-                    'AccountId': account_id,
-                    'Service': 'GuardDuty',
-                    'service': 'GuardDuty',
-                    'Region': region,
-                    'region': region,
+                    **base,
                     'Issue': 'Cannot access GuardDuty',
                     'Details': 'Insufficient permissions to check GuardDuty status',
                     'type': 'recommendation',
@@ -163,99 +326,147 @@ class GuardDutyAuditService:
         return results
     
     def get_high_severity_findings(self, session: boto3.Session, region: str, 
-                                   days: int = 30, config_manager=None, **kwargs) -> List[Dict[str, Any]]:
+                                   days: int = 30, config_manager=None,
+                                   min_severity: float = HIGH_SEVERITY_THRESHOLD,
+                                   details: bool = True, max_items: int = 500,
+                                   detectors: List[str] = None, account_id: str = None,
+                                   full_details: bool = False, detector_statuses: Dict[str, str] = None,
+                                   **kwargs) -> List[Dict[str, Any]]:
         """
         Get high and critical severity GuardDuty findings from the last N days.
         Translates findings into clear, action-oriented recommendations.
+        
+        min_severity tightens the server-side filter (e.g. CRITICAL_SEVERITY_THRESHOLD
+        for critical only). With details=False the get_findings call is skipped and
+        only the finding ids are reported, which is enough for counting.
+        At most max_items findings are listed per detector (None for all).
+        resource_details only carries RESOURCE_DETAIL_KEYS unless full_details is set.
+        Detectors detector_statuses knows to be other than ENABLED are skipped.
         """
-        gd = session.client('guardduty', region_name=region)
-        sts = session.client('sts')
-        account_id = sts.get_caller_identity()['Account']
+        gd = self._client(session, 'guardduty', region)
+        account_id = account_id or self._get_account_id(session)
+        base = {'AccountId': account_id, 'Service': 'GuardDuty', 'service': 'GuardDuty',
+                'Region': region, 'region': region}
         results = []
         
         try:
-            # List detectors first
-            detectors_response = gd.list_detectors()
-            detectors = detectors_response.get('DetectorIds', [])
+            # List detectors first, unless security_audit already did
+            if detectors is None:
+                detectors = gd.list_detectors().get('DetectorIds', [])
+            
+            if detector_statuses:
+                # Disabled detectors have no fresh findings; the status check reports them
+                detectors = [
+                    detector_id for detector_id in detectors
+                    if detector_statuses.get(detector_id, 'ENABLED') == 'ENABLED'
+                ]
             
             if not detectors:
                 # No detector, skip findings check
                 return results
             
-            for detector_id in detectors:
-                # List findings with filters for high/critical severity
-                findings_response = gd.list_findings(
-                    DetectorId=detector_id,
-                    FindingCriteria={
-                        'Criterion': {
-                            'severity': {
-                                'Gte': self.HIGH_SEVERITY_THRESHOLD  # High (7.0-8.9) and Critical (9.0-10.0)
-                            },
-                            'updatedAt': {
-                                'Gte': int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
-                            }
-                        }
+            # updatedAt filter in epoch milliseconds
+            updated_since = int((time.time() - days * 86400) * 1000)
+            
+            # Filter for high/critical severity
+            finding_criteria = {
+                'Criterion': {
+                    'severity': {
+                        'Gte': min_severity  # Default: High (7.0-8.9) and Critical (9.0-10.0)
                     },
-                    MaxResults=50  # Limit to most recent findings
-                )
-                
-                finding_ids = findings_response.get('FindingIds', [])
-                
-                if not finding_ids:
-                    # No high-severity findings - good news!
-                    continue
-                
-                # Get detailed finding information
-                findings_details = gd.get_findings(
+                    'updatedAt': {
+                        'Gte': updated_since
+                    }
+                }
+            }
+            pagination = {'PageSize': self.FINDINGS_BATCH_SIZE}
+            if max_items:
+                pagination['MaxItems'] = max_items
+            
+            def list_finding_ids(detector_id):
+                paginator = gd.get_paginator('list_findings')
+                pages = paginator.paginate(
                     DetectorId=detector_id,
-                    FindingIds=finding_ids
+                    FindingCriteria=finding_criteria,
+                    PaginationConfig=pagination
                 )
-                
-                for finding in findings_details.get('Findings', []):
-                    severity = finding.get('Severity', 0)
-                    finding_type = finding.get('Type', 'Unknown')
-                    title = finding.get('Title', 'Unknown Threat')
-                    description = finding.get('Description', '')
+                return [finding_id for page in pages for finding_id in page.get('FindingIds', [])]
+            
+            base_finding = {**base, 'type': 'security', 'check': 'guardduty_finding'}
+            
+            # List finding ids per detector, detectors side by side
+            detector_finding_ids = self._map_concurrent(list_finding_ids, detectors)
+            
+            if not details:
+                # Only ids are known; the severity is at least min_severity
+                severity_label = self._severity_label(min_severity)
+                for finding_ids in detector_finding_ids:
+                    for finding_id in finding_ids:
+                        results.append({
+                            **base_finding,
+                            'Issue': 'Security threat: GuardDuty finding',
+                            'Details': {
+                                'finding_id': finding_id
+                            },
+                            'severity': severity_label,
+                            'resource_id': finding_id or 'unknown',
+                            'resource_name': 'GuardDuty finding'
+                        })
+                return results
+            
+            # Get detailed finding information, get_findings takes up to 50 ids per call
+            batch_size = self.FINDINGS_BATCH_SIZE
+            batches = [
+                (detector_id, finding_ids[i:i + batch_size])
+                for detector_id, finding_ids in zip(detectors, detector_finding_ids)
+                for i in range(0, len(finding_ids), batch_size)
+            ]
+            batch_findings = self._map_concurrent(
+                lambda batch: gd.get_findings(DetectorId=batch[0], FindingIds=batch[1]).get('Findings', []),
+                batches
+            )
+            
+            # Loop-invariant lookups bound to locals
+            resource_detail_keys = self.RESOURCE_DETAIL_KEYS
+            severity_thresholds = self._SEVERITY_THRESHOLDS
+            severity_labels = self._SEVERITY_LABELS
+            bisect_right = bisect.bisect_right
+            translate = self._translate_finding_to_action
+            append = results.append
+            
+            for findings in batch_findings:
+                for finding in findings:
+                    get = finding.get
+                    finding_id = get('Id')
+                    severity = get('Severity', 0)
+                    finding_type = get('Type', 'Unknown')
+                    title = get('Title', 'Unknown Threat')
                     
                     # Translate finding to action-oriented recommendation
-                    action = self._translate_finding_to_action(finding_type, finding)
-                    
-                    # Determine severity label
-                    if severity >= self.CRITICAL_SEVERITY_THRESHOLD:
-                        severity_label = 'critical'
-                    elif severity >= self.HIGH_SEVERITY_THRESHOLD:
-                        severity_label = 'high'
-                    elif severity >= self.MEDIUM_SEVERITY_THRESHOLD:
-                        severity_label = 'medium'
-                    else:
-                        severity_label = 'low'
+                    action = translate(finding_type, finding)
                     
                     # Get resource information
-                    resource = finding.get('Resource', {})
+                    resource = get('Resource', {})
                     resource_type = resource.get('ResourceType', 'Unknown')
+                    if not full_details:
+                        resource = {key: resource[key] for key in resource_detail_keys if key in resource}
                     
-                    results.append({
-                        'AccountId': account_id,
-                        'Service': 'GuardDuty',
-                        'service': 'GuardDuty',
-                        'Region': region,
-                        'region': region,
+                    append({
+                        **base_finding,
                         'Issue': f'Security threat: {title}',
                         'Details': {
-                            'finding_id': finding.get('Id', 'Unknown'),
+                            'finding_id': finding_id or 'Unknown',
                             'finding_type': finding_type,
                             'severity_score': severity,
-                            'description': description,
+                            'description': get('Description', ''),
                             'resource_type': resource_type,
                             'resource_details': resource,
-                            'first_seen': finding.get('CreatedAt', ''),
-                            'last_seen': finding.get('UpdatedAt', ''),
-                            'count': finding.get('Service', {}).get('Count', 1)
+                            'first_seen': get('CreatedAt', ''),
+                            'last_seen': get('UpdatedAt', ''),
+                            'count': get('Service', {}).get('Count', 1)
                         },
-                        'type': 'security',
-                        'severity': severity_label,
-                        'check': 'guardduty_finding',
-                        'resource_id': finding.get('Id', 'unknown'),
+                        'severity': severity_labels[bisect_right(severity_thresholds, severity)],
+                        'resource_id': finding_id,
                         'resource_name': title,
                         'Recommendation': action,
                         'Action': action
@@ -263,7 +474,7 @@ class GuardDutyAuditService:
         
         except Exception as e:
             # If we can't get findings, it might be because GuardDuty is not enabled
-            if 'BadRequestException' in str(e) or 'NotFoundException' in str(e):
+            if self._error_code(e) in self.DETECTOR_MISSING_CODES:
                 # Already handled in check_guardduty_status
                 pass
             else:
@@ -271,17 +482,19 @@ class GuardDutyAuditService:
         
         return results
     
+    def _severity_label(self, severity: float) -> str:
+        """Map a GuardDuty severity score to critical/high/medium/low"""
+        return self._SEVERITY_LABELS[bisect.bisect_right(self._SEVERITY_THRESHOLDS, severity)]
+    
     def _translate_finding_to_action(self, finding_type: str, finding: Dict[str, Any]) -> str:
         """
         Translate GuardDuty finding type into clear, action-oriented recommendation.
         """
-        # Use finding type actions from class constant
-        actions = self.FINDING_TYPE_ACTIONS
-        
-        # Try to find matching action based on finding type prefix
-        for pattern, action in actions.items():
-            if finding_type.startswith(pattern):
-                return action
+        # Finding types look like 'Category:Resource/Detail' (e.g. 'Recon:IAMUser/...'),
+        # patterns like 'Category:Resource' matched as a prefix
+        match = self._FINDING_TYPE_RE.match(finding_type)
+        if match:
+            return self._ACTION_BY_GROUP[match.lastgroup]
         
         # Default action if no specific match
         return f'Security issue detected: {finding_type}. Review finding details and take appropriate remediation action based on severity.'
@@ -295,18 +508,24 @@ class GuardDutyAuditService:
         combined_alerts = []
         
         # Create a map of resources from security findings
-        security_resources = {}
-        for finding in security_findings:
-            resource_id = finding.get('resource_id', '')
-            if resource_id:
-                security_resources[resource_id] = finding
+        security_resources = {
+            finding['resource_id']: finding
+            for finding in security_findings if finding.get('resource_id')
+        }
+        
+        # Resources present on both sides; nothing to combine without overlap
+        shared_ids = security_resources.keys() & {finding.get('resource_id') for finding in cost_findings}
+        if not shared_ids:
+            return combined_alerts
         
-        # Check cost findings against security findings
+        # Walk cost findings in order so each matching one still yields its alert
         for cost_finding in cost_findings:
             resource_id = cost_finding.get('resource_id', '')
             
-            if resource_id in security_resources:
+            if resource_id in shared_ids:
                 security_finding = security_resources[resource_id]
+                cost_recommendation = cost_finding.get('Recommendation', '')
+                security_recommendation = security_finding.get('Recommendation', '')
                 
                 # Create combined alert
                 combined_alerts.append({
@@ -328,7 +547,7 @@ class GuardDutyAuditService:
                     'resource_id': resource_id,
                     'resource_name': cost_finding.get('resource_name', resource_id),
                     'monthly_cost': cost_finding.get('monthly_cost', 0),
-                    'Recommendation': f'PRIORITY: Address both cost and security issues. {cost_finding.get("Recommendation", "")} AND {security_finding.get("Recommendation", "")}'
+                    'Recommendation': f'PRIORITY: Address both cost and security issues. {cost_recommendation} AND {security_recommendation}'
                 })
         
         return combined_alerts
@@ -0,0 +1,59 @@
+"""Request parsing for the payloads the test dashboard actually sends"""
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_cors')
+pytest.importorskip('boto3')
+
+from kosty import api
+
+
+@pytest.fixture
+def client():
+    api.app.config['TESTING'] = True
+    with api.app.test_client() as client:
+        yield client
+
+
+def test_audit_page_payload():
+    # AuditPage: select value for organization, edited number input for max_workers
+    parsed = api._parse_request(
+        {'regions': ['us-east-1', 'eu-west-1'], 'max_workers': '8', 'organization': 'false'},
+        api.AUDIT_REQUEST_FIELDS
+    )
+
+    assert parsed['organization'] is False
+    assert parsed['max_workers'] == 8
+    assert parsed['regions'] == ['us-east-1', 'eu-west-1']
+
+
+def test_audit_page_payload_organization_true():
+    parsed = api._parse_request({'organization': 'true'}, api.AUDIT_REQUEST_FIELDS)
+
+    assert parsed['organization'] is True
+
+
+def test_alerts_configure_page_payload(client):
+    # AlertsConfigurePage: number inputs are posted as strings once edited
+    response = client.post('/api/alerts/configure', json={
+        'budget_threshold_percentage': '85.5',
+        'cost_spike_threshold': 100,
+        'idle_days_threshold': '7'
+    })
+
+    assert response.status_code == 200
+    configuration = response.get_json()['configuration']
+    assert configuration['budget_threshold_percentage'] == 85.5
+    assert configuration['cost_spike_threshold'] == 100
+    assert configuration['idle_days_threshold'] == 7
+
+
+def test_unconvertible_strings_are_still_rejected(client):
+    response = client.post('/api/alerts/configure', json={'idle_days_threshold': 'seven'})
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'idle_days_threshold must be an integer'
+
+    with pytest.raises(api.RequestValidationError):
+        api._parse_request({'organization': 'yes'}, api.AUDIT_REQUEST_FIELDS)